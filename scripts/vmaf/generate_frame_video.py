@@ -52,6 +52,7 @@ ARGUMENTS:
               Options: ultrafast, superfast, veryfast, faster, fast, medium, slow, slower, veryslow
     --crf: Constant Rate Factor for quality, 0-51 (default: 23)
            Lower values = better quality but larger file size
+    --workers: Render processes for the OpenCV fallback renderer (default: CPU count)
 
 OUTPUT:
     Creates an H.264 encoded MP4 file containing:
@@ -70,93 +71,338 @@ EXAMPLES:
     python3 generate_frame_video.py marked_content.mp4 --duration 10 --concat content.mp4
 
 NOTE:
-    Frame numbers are rendered in white text on black background using OpenCV's
-    FONT_HERSHEY_SIMPLEX font at size 8 with thickness 15 for maximum readability.
+    Frame numbers are rendered in white text on black background by FFmpeg's drawtext
+    filter (bold DejaVu/Arial at 1/3 of the frame height) and encoded in a single pass.
+    If FFmpeg was built without drawtext, or no font is found, the script falls back to
+    OpenCV's FONT_HERSHEY_SIMPLEX font at size 8 with thickness 15.
 """
 import cv2
 import numpy as np
 import argparse
+import json
 import subprocess
 import os
+import multiprocessing
+from collections import deque
 from pathlib import Path
 
-def generate_frame_video(output_path, duration_seconds=10, fps=30, width=1920, height=1080):
-    """Generate a video with frame numbers on black background."""
+# Bold TrueType fonts tried in order for FFmpeg's drawtext filter
+FONT_CANDIDATES = [
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',  # Debian/Ubuntu
+    '/usr/share/fonts/dejavu-sans-fonts/DejaVuSans-Bold.ttf',  # Fedora
+    '/usr/share/fonts/TTF/DejaVuSans-Bold.ttf',  # Arch
+    '/System/Library/Fonts/Supplemental/Arial Bold.ttf',  # macOS
+    'C:/Windows/Fonts/arialbd.ttf',  # Windows
+]
+
+# Raw BGR bytes per render task and in flight between the render pool and FFmpeg
+RENDER_CHUNK_BYTES = 32 * 1024 * 1024
+RENDER_INFLIGHT_BYTES = 512 * 1024 * 1024
+
+def find_font():
+    """Return the first available bold font for drawtext, or None."""
+    for font_path in FONT_CANDIDATES:
+        if os.path.exists(font_path):
+            return font_path
+    return None
+
+def has_drawtext():
+    """Check whether the installed FFmpeg was built with the drawtext filter."""
+    try:
+        result = subprocess.run(['ffmpeg', '-hide_banner', '-filters'],
+                                check=True, capture_output=True, text=True)
+    except (OSError, subprocess.CalledProcessError):
+        return False
+    return ' drawtext ' in result.stdout
+
+def drawtext_filter(text, font_path, height):
+    """Build a drawtext filter rendering centered white text sized relative to the frame height."""
+    # Filter option values treat ':' and '\\' specially (Windows drive letters and separators)
+    font_path = font_path.replace('\\', '/').replace(':', '\\:')
+    return (f"drawtext=fontfile='{font_path}':text='{text}':start_number=1:"
+            f"fontcolor=white:fontsize={height // 3}:x=(w-text_w)/2:y=(h-text_h)/2")
+
+def h264_encode_args(preset="medium", crf=23):
+    """FFmpeg output arguments shared by every libx264 encode."""
+    x264_params = ['-x264-params', 'threads=auto']
+    if preset != 'ultrafast':  # ultrafast disables lookahead entirely
+        x264_params[1] += f':lookahead-threads={min(6, os.cpu_count() or 1)}'
+    return [
+        '-c:v', 'libx264',
+        '-preset', preset,
+        '-crf', str(crf),
+        '-pix_fmt', 'yuv420p',
+        '-threads', '0',
+        *x264_params,
+        '-movflags', '+faststart',  # moov atom up front for streaming/VMAF readers
+    ]
 
-    # Calculate total frames
-    total_frames = duration_seconds * fps
+def run_ffmpeg(cmd, description):
+    """Run an FFmpeg command, reporting failures with FFmpeg's stderr."""
+    # Only errors reach stderr, so the pipe stays small on long encodes
+    cmd = [cmd[0], '-hide_banner', '-loglevel', 'error', *cmd[1:]]
+    try:
+        subprocess.run(cmd, check=True, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.PIPE, text=True, errors='replace')
+        print(f"{description} successful")
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"{description} failed: {e}")
+        print(f"FFmpeg stderr: {e.stderr}")
+        return False
 
-    # Define the codec and create VideoWriter object
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+def generate_frame_video(output_path, duration_seconds=10, fps=30, width=1920, height=1080, preset="medium", crf=23, workers=None):
+    """Generate an H.264 video with frame numbers on black background in a single FFmpeg pass."""
+    total_frames = duration_seconds * fps
 
     print(f"Generating {duration_seconds}s video at {fps}fps ({total_frames} frames)")
     print(f"Resolution: {width}x{height}")
     print(f"Output: {output_path}")
 
-    for frame_num in range(1, total_frames + 1):
-        # Create black frame
-        frame = np.zeros((height, width, 3), dtype=np.uint8)
+    font_path = find_font()
+    if font_path is None or not has_drawtext():
+        print("FFmpeg drawtext filter or font not available, falling back to OpenCV renderer")
+        return render_frame_video(output_path, duration_seconds, fps, width, height, preset, crf, workers)
 
-        # Add frame number text
-        text = str(frame_num)
+    # lavfi color source + drawtext renders and encodes every frame inside FFmpeg
+    cmd = [
+        'ffmpeg',
+        '-f', 'lavfi',
+        '-i', f'color=c=black:s={width}x{height}:r={fps}:d={duration_seconds}',
+        '-vf', drawtext_filter('%{frame_num}', font_path, height),
+        *h264_encode_args(preset, crf),
+        '-y',  # Overwrite output
+        output_path
+    ]
+
+    if not run_ffmpeg(cmd, "Frame video generation"):
+        return False
+    print(f"Video generated successfully: {output_path}")
+    return True
+
+def open_raw_h264_pipe(output_path, fps, width, height, preset="medium", crf=23):
+    """Start an FFmpeg process that encodes raw BGR frames written to its stdin as H.264."""
+    cmd = [
+        'ffmpeg',
+        '-hide_banner',
+        '-loglevel', 'error',  # Keep stderr small, it is only read after the pipe closes
+        '-f', 'rawvideo',
+        '-pix_fmt', 'bgr24',
+        '-s', f'{width}x{height}',
+        '-r', str(fps),
+        '-i', '-',
+        *h264_encode_args(preset, crf),
+        '-y',  # Overwrite output
+        output_path
+    ]
+    return subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+
+def close_raw_h264_pipe(process, description):
+    """Finish writing to an FFmpeg raw-frame pipe and report whether the encode succeeded."""
+    try:
+        process.stdin.close()
+    except BrokenPipeError:
+        pass
+    stderr = process.stderr.read().decode(errors='replace')
+    process.wait()
+    if process.returncode != 0:
+        print(f"{description} failed with return code {process.returncode}")
+        print(f"FFmpeg stderr: {stderr}")
+        return False
+    print(f"{description} successful")
+    return True
+
+def render_digit_glyphs(font, font_scale, thickness):
+    """Rasterize digits 0-9 once into padded white-on-black tiles plus their advances."""
+    (_, text_height), baseline = cv2.getTextSize('0123456789', font, font_scale, thickness)
+    pad = thickness  # Stroke thickness spills outside the advance box
+
+    glyphs = {}
+    advances = {}
+    for digit in '0123456789':
+        (digit_width, _), _ = cv2.getTextSize(digit, font, font_scale, thickness)
+        (pair_width, _), _ = cv2.getTextSize(digit * 2, font, font_scale, thickness)
+        advances[digit] = pair_width - digit_width
+
+        tile = np.zeros((pad + text_height + baseline + pad, pad + digit_width + pad, 3), dtype=np.uint8)
+        cv2.putText(tile, digit, (pad, pad + text_height), font, font_scale, (255, 255, 255), thickness)
+        glyphs[digit] = tile
+
+    # getTextSize reports the advances plus a constant trailing margin
+    (one_width, _), _ = cv2.getTextSize('0', font, font_scale, thickness)
+    margin = one_width - advances['0']
+    return glyphs, advances, margin, pad, text_height
+
+def blit_glyph(frame, tile, x, y):
+    """Composite a glyph tile onto the frame at (x, y), clipped to the frame bounds."""
+    frame_height, frame_width = frame.shape[:2]
+    tile_height, tile_width = tile.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + tile_width, frame_width), min(y + tile_height, frame_height)
+    if x0 >= x1 or y0 >= y1:
+        return
+    region = frame[y0:y1, x0:x1]
+    # Neighbouring glyph strokes overlap, so merge instead of overwriting
+    np.maximum(region, tile[y0 - y:y1 - y, x0 - x:x1 - x], out=region)
+
+class FrameNumberRenderer:
+    """Draws centered frame numbers from cached digit glyphs into one reused buffer."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
 
-        # Calculate text size and position
         font = cv2.FONT_HERSHEY_SIMPLEX
         font_scale = 8  # Large font
         thickness = 15
 
-        # Get text size
-        (text_width, text_height), baseline = cv2.getTextSize(text, font, font_scale, thickness)
+        # Rasterize the digits once and composite them per frame
+        self.glyphs, self.advances, self.margin, self.pad, self.text_height = \
+            render_digit_glyphs(font, font_scale, thickness)
+        self.tile_height = next(iter(self.glyphs.values())).shape[0]
 
-        # Center the text
-        x = (width - text_width) // 2
-        y = (height + text_height) // 2
+        # Single frame buffer; only the previous number's bounding box is cleared
+        self.frame = np.zeros((height, width, 3), dtype=np.uint8)
+        self.dirty = None
 
-        # Draw white text
-        cv2.putText(frame, text, (x, y), font, font_scale, (255, 255, 255), thickness)
+    def render(self, frame_num):
+        """Return the buffer holding frame_num; it is overwritten by the next call."""
+        # Reset to a black frame
+        if self.dirty is not None:
+            self.frame[self.dirty] = 0
 
-        # Write frame
-        out.write(frame)
+        # Add frame number text
+        text = str(frame_num)
+        text_width = sum(self.advances[digit] for digit in text) + self.margin
 
-        # Progress indicator
-        if frame_num % 30 == 0 or frame_num == total_frames:
-            progress = (frame_num / total_frames) * 100
-            print(f"Progress: {progress:.1f}% (frame {frame_num}/{total_frames})")
+        # Center the text
+        x = (self.width - text_width) // 2
+        y = (self.height + self.text_height) // 2
+
+        top = y - self.text_height - self.pad
+        self.dirty = (slice(max(top, 0), max(top + self.tile_height, 0)),
+                      slice(max(x - self.pad, 0), max(x + text_width + self.pad, 0)))
+
+        # Draw white text from the cached glyphs
+        for digit in text:
+            blit_glyph(self.frame, self.glyphs[digit], x - self.pad, top)
+            x += self.advances[digit]
+
+        return self.frame
+
+# Per-process renderer used by the worker pool
+_worker_renderer = None
+
+def _init_render_worker(width, height):
+    global _worker_renderer
+    _worker_renderer = FrameNumberRenderer(width, height)
+
+def _render_frame_chunk(frame_range):
+    """Render a contiguous range of frame numbers into one raw BGR array."""
+    first, last = frame_range
+    chunk = np.empty((last - first + 1, _worker_renderer.height, _worker_renderer.width, 3), dtype=np.uint8)
+    for i, frame_num in enumerate(range(first, last + 1)):
+        chunk[i] = _worker_renderer.render(frame_num)
+    # The array pickles straight from its buffer and the pipe accepts it as is
+    return chunk
+
+def render_frame_video(output_path, duration_seconds=10, fps=30, width=1920, height=1080, preset="medium", crf=23, workers=None):
+    """Render frame numbers with OpenCV when FFmpeg lacks drawtext, piping raw frames to libx264."""
+    # Calculate total frames
+    total_frames = duration_seconds * fps
+    workers = workers or os.cpu_count() or 1
 
-    # Release everything
-    out.release()
-    print(f"Video generated successfully: {output_path}")
+    # FFmpeg performs the only encode, straight from the raw frames
+    process = open_raw_h264_pipe(output_path, fps, width, height, preset, crf)
 
-def convert_to_h264(input_path, output_path, preset="medium", crf=23):
-    """Convert video to H.264 format."""
+    try:
+        if workers == 1:
+            renderer = FrameNumberRenderer(width, height)
+            for frame_num in range(1, total_frames + 1):
+                # Write frame (the pipe copies it, so the buffer can be reused right away)
+                process.stdin.write(renderer.render(frame_num))
+
+                # Progress indicator
+                if frame_num % 30 == 0 or frame_num == total_frames:
+                    progress = (frame_num / total_frames) * 100
+                    print(f"Progress: {progress:.1f}% (frame {frame_num}/{total_frames})")
+        else:
+            # Frames are independent: shard them across processes in chunks of about RENDER_CHUNK_BYTES
+            frame_bytes = width * height * 3
+            chunk_frames = max(1, RENDER_CHUNK_BYTES // frame_bytes)
+            chunks = [(first, min(first + chunk_frames - 1, total_frames))
+                      for first in range(1, total_frames + 1, chunk_frames)]
+            # Cap the chunks rendered but not yet written by bytes, not just by worker count
+            window = max(1, min(2 * workers, RENDER_INFLIGHT_BYTES // (chunk_frames * frame_bytes)))
+            print(f"Rendering with {workers} worker processes")
+
+            with multiprocessing.Pool(workers, _init_render_worker, (width, height)) as pool:
+                # Bounded window of in-flight chunks keeps memory flat while FFmpeg catches up
+                pending = deque(pool.apply_async(_render_frame_chunk, (frame_range,))
+                                for frame_range in chunks[:window])
+                next_chunks = iter(chunks[window:])
+                next_report = fps
+
+                for _, last in chunks:
+                    # Results are consumed in submission order, so frames stay in sequence
+                    process.stdin.write(pending.popleft().get())
+                    if last >= next_report or last == total_frames:
+                        print(f"Progress: {last / total_frames * 100:.1f}% (frame {last}/{total_frames})")
+                        next_report = last + fps
+
+                    frame_range = next(next_chunks, None)
+                    if frame_range is not None:
+                        pending.append(pool.apply_async(_render_frame_chunk, (frame_range,)))
+    except BrokenPipeError:
+        print("FFmpeg exited before all frames were written")
+
+    return close_raw_h264_pipe(process, "Frame video encoding")
+
+def convert_to_h264(input_path, output_path, preset="medium", crf=23, width=None, height=None, fps=None):
+    """Convert video to H.264 format, optionally conforming its resolution and framerate."""
     print(f"Converting to H.264 format...")
 
+    video_filters = []
+    if width and height:
+        video_filters.append(f'scale={width}:{height}')
+    if fps:
+        video_filters.append(f'fps={fps}')
+
     cmd = [
         'ffmpeg',
         '-i', input_path,
-        '-c:v', 'libx264',
-        '-preset', preset,
-        '-crf', str(crf),
+        *(['-vf', ','.join(video_filters)] if video_filters else []),
+        *h264_encode_args(preset, crf),
         '-y',  # Overwrite output
         output_path
     ]
 
-    try:
-        subprocess.run(cmd, check=True, capture_output=True, text=True)
-        print(f"H.264 conversion successful: {output_path}")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"H.264 conversion failed: {e}")
-        return False
+    return run_ffmpeg(cmd, f"H.264 conversion to {output_path}")
 
-def create_black_frame_video(output_path, fps=30, width=1920, height=1080):
-    """Create a single black frame video with 'END' text."""
+def create_black_frame_video(output_path, fps=30, width=1920, height=1080, preset="medium", crf=23):
+    """Create a single H.264 black frame video with 'END' text."""
     print(f"Creating single black frame video with 'END' text: {output_path}")
 
-    # Define the codec and create VideoWriter object
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+    font_path = find_font()
+    if font_path is None or not has_drawtext():
+        return render_black_frame_video(output_path, fps, width, height, preset, crf)
+
+    cmd = [
+        'ffmpeg',
+        '-f', 'lavfi',
+        '-i', f'color=c=black:s={width}x{height}:r={fps}',
+        '-vf', drawtext_filter('END', font_path, height),
+        '-frames:v', '1',
+        *h264_encode_args(preset, crf),
+        '-y',  # Overwrite output
+        output_path
+    ]
+
+    return run_ffmpeg(cmd, "Black frame video with 'END' text")
+
+def render_black_frame_video(output_path, fps=30, width=1920, height=1080, preset="medium", crf=23):
+    """Render the 'END' frame with OpenCV when FFmpeg lacks drawtext, piping it to libx264."""
+    process = open_raw_h264_pipe(output_path, fps, width, height, preset, crf)
 
     # Create black frame
     frame = np.zeros((height, width, 3), dtype=np.uint8)
@@ -178,96 +424,196 @@ def create_black_frame_video(output_path, fps=30, width=1920, height=1080):
     cv2.putText(frame, text, (x, y), font, font_scale, (255, 255, 255), thickness)
 
     # Write the single black frame with END text
-    out.write(frame)
+    try:
+        process.stdin.write(frame.tobytes())
+    except BrokenPipeError:
+        pass
 
-    # Release everything
-    out.release()
-    print(f"Black frame video with 'END' text created: {output_path}")
+    return close_raw_h264_pipe(process, "Black frame video with 'END' text")
 
-def create_black_duration_video(output_path, duration_seconds=10, fps=30, width=1920, height=1080):
-    """Create a video of black frames for specified duration."""
+def create_black_duration_video(output_path, duration_seconds=10, fps=30, width=1920, height=1080, preset="medium", crf=23):
+    """Create an H.264 video of black frames for specified duration."""
     print(f"Creating {duration_seconds}s black video: {output_path}")
 
-    # Define the codec and create VideoWriter object
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+    cmd = [
+        'ffmpeg',
+        '-f', 'lavfi',
+        '-i', f'color=c=black:s={width}x{height}:r={fps}:d={duration_seconds}',
+        *h264_encode_args(preset, crf),
+        '-y',  # Overwrite output
+        output_path
+    ]
 
-    # Calculate total frames
-    total_frames = duration_seconds * fps
+    return run_ffmpeg(cmd, "Black duration video")
 
-    # Create black frame
-    frame = np.zeros((height, width, 3), dtype=np.uint8)
+def probe_streams(video_path):
+    """Return the ffprobe stream list for a video file."""
+    cmd = ['ffprobe', '-v', 'error', '-show_streams', '-of', 'json', video_path]
+    result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+    return json.loads(result.stdout)['streams']
 
-    # Write black frames for the duration
-    for _ in range(total_frames):
-        out.write(frame)
+def stream_signature(streams, codec_type):
+    """Parameters that must match across inputs for the concat demuxer to stream copy."""
+    if codec_type == 'video':
+        keys = ('codec_name', 'width', 'height', 'pix_fmt', 'r_frame_rate', 'time_base')
+    else:
+        keys = ('codec_name', 'sample_rate', 'channels')
+    return [tuple(s.get(key) for key in keys) for s in streams if s.get('codec_type') == codec_type]
 
-    # Release everything
-    out.release()
-    print(f"Black duration video created: {output_path}")
+def remux_to_mpegts(input_path, ts_path):
+    """Remux an H.264 MP4 into an MPEG-TS intermediate for the concat protocol."""
+    cmd = [
+        'ffmpeg',
+        '-i', input_path,
+        '-c', 'copy',
+        '-bsf:v', 'h264_mp4toannexb',
+        '-f', 'mpegts',
+        '-y',  # Overwrite output
+        ts_path
+    ]
+    return run_ffmpeg(cmd, f"MPEG-TS remux of {input_path}")
 
 def concatenate_videos(frame_video_path, target_video_path, output_path, preset="medium", crf=23, with_10s_black=False):
     """Concatenate frame video with target video and add one black frame at the end."""
     print(f"Concatenating videos with black frame at end...")
 
-    # Get video dimensions from the frame video
-    import cv2
-    cap = cv2.VideoCapture(frame_video_path)
-    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    cap.release()
-
-    # Create a single black frame video with matching dimensions
-    black_frame_video = "temp_black_frame.mp4"
-    create_black_frame_video(black_frame_video, fps, width, height)
-
-    # Convert black frame to H.264
-    black_frame_h264 = "temp_black_frame_h264.mp4"
-    if not convert_to_h264(black_frame_video, black_frame_h264, preset, crf):
-        print("Failed to convert black frame to H.264")
+    temp_files = []
+    try:
+        frame_streams = probe_streams(frame_video_path)
+        target_streams = probe_streams(target_video_path)
+    except (OSError, subprocess.CalledProcessError, json.JSONDecodeError) as e:
+        print(f"Could not probe inputs with ffprobe: {e}")
         return False
 
-    # Clean up original black frame
-    os.remove(black_frame_video)
-
-    # Create temporary concat list with black frame at the end
-    concat_list = "temp_concat_list.txt"
-    with open(concat_list, 'w') as f:
-        f.write(f"file '{frame_video_path}'\n")
-        f.write(f"file '{target_video_path}'\n")
-        f.write(f"file '{black_frame_h264}'\n")
+    # Get video dimensions from the frame video
+    frame_video_stream = next(s for s in frame_streams if s.get('codec_type') == 'video')
+    width = frame_video_stream['width']
+    height = frame_video_stream['height']
+    num, den = frame_video_stream['r_frame_rate'].split('/')
+    fps = int(num) / int(den)
+
+    # Stream copy is possible when every input carries identical video parameters
+    frame_video = stream_signature(frame_streams, 'video')
+    copy_video = True
+    if stream_signature(target_streams, 'video') != frame_video:
+        # Only the target differs: conform it once so the join itself is a copy
+        print("Target video parameters differ, transcoding target to match frame video")
+        conformed_target = "temp_target_h264.mp4"
+        temp_files.append(conformed_target)
+        if convert_to_h264(target_video_path, conformed_target, preset, crf, width, height, fps):
+            target_video_path = conformed_target
+            try:
+                target_streams = probe_streams(conformed_target)
+            except (OSError, subprocess.CalledProcessError, json.JSONDecodeError) as e:
+                print(f"Could not probe conformed target: {e}")
+                target_streams = []
+            # Conforming may still leave e.g. the time base different; copying then breaks the join
+            copy_video = stream_signature(target_streams, 'video') == frame_video
+            if not copy_video:
+                print("Conformed target still differs from frame video, re-encoding the join")
+        else:
+            copy_video = False
 
-    cmd = [
-        'ffmpeg',
-        '-f', 'concat',
-        '-safe', '0',
-        '-i', concat_list,
-        '-c:v', 'libx264',
-        '-c:a', 'aac',
-        '-preset', preset,
-        '-crf', str(crf),
-        '-y',  # Overwrite output
-        output_path
-    ]
+    black_frame_h264 = "temp_black_frame_h264.mp4"
+    if copy_video:
+        # Create a single H.264 black frame video with matching dimensions
+        temp_files.append(black_frame_h264)
+        if not create_black_frame_video(black_frame_h264, fps, width, height, preset, crf):
+            print("Failed to create black frame video")
+            return False
+        # Same encoder settings as the frame video, but verify before copying
+        try:
+            black_streams = probe_streams(black_frame_h264)
+        except (OSError, subprocess.CalledProcessError, json.JSONDecodeError) as e:
+            print(f"Could not probe black frame video: {e}")
+            black_streams = []
+        copy_video = stream_signature(black_streams, 'video') == frame_video
+
+    # The frame and END videos carry no audio, so audio only copies if the target has none
+    copy_audio = stream_signature(frame_streams, 'audio') == stream_signature(target_streams, 'audio')
+
+    inputs = [frame_video_path, target_video_path, black_frame_h264]
+    cmd = None
+
+    if copy_video and copy_audio:
+        # Lossless append: Annex B MPEG-TS intermediates joined by the concat protocol
+        print("Input parameters match, concatenating MPEG-TS intermediates with stream copy")
+        ts_paths = [f"temp_concat_{i}.ts" for i in range(len(inputs))]
+        temp_files.extend(ts_paths)
+        if all(remux_to_mpegts(input_path, ts_path) for input_path, ts_path in zip(inputs, ts_paths)):
+            # copy_audio means the target has no audio either, so there is no AAC to re-wrap
+            cmd = [
+                'ffmpeg',
+                '-i', 'concat:' + '|'.join(ts_paths),
+                '-c', 'copy',
+                '-movflags', '+faststart',
+                '-y',  # Overwrite output
+                output_path
+            ]
+
+    if cmd is None and copy_video:
+        # Create temporary concat list with black frame at the end
+        print("Video parameters match, concatenating with video stream copy")
+        concat_list = "temp_concat_list.txt"
+        temp_files.append(concat_list)
+        with open(concat_list, 'w') as f:
+            for input_path in inputs:
+                f.write(f"file '{input_path}'\n")
+
+        cmd = [
+            'ffmpeg',
+            '-f', 'concat',
+            '-safe', '0',
+            '-i', concat_list,
+            '-c:v', 'copy',
+            '-c:a', 'aac',
+            '-movflags', '+faststart',
+            '-y',  # Overwrite output
+            output_path
+        ]
+
+    if cmd is None:
+        # Re-encode in one pass, generating the black END frame inside the filter graph
+        font_path = find_font()
+        if font_path is not None and has_drawtext():
+            end_input = ['-f', 'lavfi', '-i', f'color=c=black:s={width}x{height}:r={fps}:d={1 / fps}']
+            end_filter = f"[2:v]{drawtext_filter('END', font_path, height)}[end]"
+        else:
+            if black_frame_h264 not in temp_files:
+                temp_files.append(black_frame_h264)
+                if not create_black_frame_video(black_frame_h264, fps, width, height, preset, crf):
+                    print("Failed to create black frame video")
+                    return False
+            end_input = ['-i', black_frame_h264]
+            end_filter = "[2:v]null[end]"
+
+        # The concat filter needs every segment at the frame video's size and rate
+        filter_complex = ";".join([
+            "[0:v]setsar=1[head]",
+            f"[1:v]scale={width}:{height},setsar=1,fps={fps}[target]",
+            end_filter,
+            "[head][target][end]concat=n=3:v=1:a=0[v]",
+        ])
+        cmd = [
+            'ffmpeg',
+            '-i', frame_video_path,
+            '-i', target_video_path,
+            *end_input,
+            '-filter_complex', filter_complex,
+            '-map', '[v]',
+            *h264_encode_args(preset, crf),
+            '-y',  # Overwrite output
+            output_path
+        ]
 
     try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        print(f"Concatenation successful: {output_path}")
+        return run_ffmpeg(cmd, f"Concatenation to {output_path}")
 
+    finally:
         # Clean up temp files
-        os.remove(concat_list)
-        os.remove(black_frame_h264)
-        return True
-
-    except subprocess.CalledProcessError as e:
-        print(f"Concatenation failed: {e}")
-        print(f"FFmpeg stderr: {e.stderr}")
-        if os.path.exists(concat_list):
-            os.remove(concat_list)
-        if os.path.exists(black_frame_h264):
-            os.remove(black_frame_h264)
-        return False
+        for temp_file in temp_files:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
 
 def main():
     parser = argparse.ArgumentParser(description='Generate test video with frame numbers and optionally concatenate')
@@ -279,22 +625,16 @@ def main():
     parser.add_argument('--concat', help='Video file to concatenate after the frame video')
     parser.add_argument('--preset', default='medium', choices=['ultrafast', 'superfast', 'veryfast', 'faster', 'fast', 'medium', 'slow', 'slower', 'veryslow'], help='FFmpeg encoding preset (default: medium)')
     parser.add_argument('--crf', type=int, default=23, help='Constant Rate Factor for quality (lower = better quality, default: 23)')
+    parser.add_argument('--workers', type=int, default=None, help='Render processes for the OpenCV fallback renderer (default: CPU count)')
 
     args = parser.parse_args()
 
-    # Generate base frame video
-    temp_frame_video = "temp_frame_video.mp4"
-    generate_frame_video(temp_frame_video, args.duration, args.fps, args.width, args.height)
-
-    # Convert to H.264
+    # Generate base frame video directly as H.264
     frame_video_h264 = "temp_frame_video_h264.mp4"
-    if not convert_to_h264(temp_frame_video, frame_video_h264, args.preset, args.crf):
-        print("Failed to convert frame video to H.264")
+    if not generate_frame_video(frame_video_h264, args.duration, args.fps, args.width, args.height, args.preset, args.crf, args.workers):
+        print("Failed to generate frame video")
         return
 
-    # Clean up original MPEG-4 file
-    os.remove(temp_frame_video)
-
     if args.concat:
         # Concatenate with target video
         if not os.path.exists(args.concat):
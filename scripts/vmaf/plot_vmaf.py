@@ -4,26 +4,36 @@
 Loads VMAF JSON output files and generates visualization plots including histogram
 distributions by quality categories and frame-by-frame score plots.
 """
+import argparse
 import json
 import sys
 import os
+import matplotlib
+matplotlib.use('Agg')  # Headless rendering; avoids importing a GUI toolkit
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+try:
+    import orjson  # Optional: much faster parsing of large VMAF logs
+except ImportError:
+    orjson = None
+
 def load_vmaf_json(json_path):
     """Load VMAF JSON file and extract frame scores and overall statistics"""
-    with open(json_path, 'r') as f:
-        data = json.load(f)
-
-    frames = data['frames']
-    scores = []
-    frame_numbers = []
-
-    for frame in frames:
-        if 'metrics' in frame and 'vmaf' in frame['metrics']:
-            scores.append(frame['metrics']['vmaf'])
-            frame_numbers.append(frame['frameNum'])
+    raw = Path(json_path).read_bytes()
+    data = orjson.loads(raw) if orjson else json.loads(raw)
+
+    # Single comprehension pass: one metrics lookup per frame and no per-frame append calls
+    pairs = [(frame['frameNum'], metrics['vmaf'])
+             for frame in data['frames']
+             if (metrics := frame.get('metrics')) and 'vmaf' in metrics]
+    if pairs:
+        frame_iter, score_iter = zip(*pairs)
+    else:
+        frame_iter, score_iter = (), ()
+    frame_numbers = np.fromiter(frame_iter, dtype=np.int32, count=len(pairs))
+    scores = np.fromiter(score_iter, dtype=np.float64, count=len(pairs))
 
     # Extract overall VMAF statistics if available
     vmaf_stats = None
@@ -32,34 +42,45 @@ def load_vmaf_json(json_path):
 
     return scores, frame_numbers, vmaf_stats
 
-def get_quality_bucket(score):
-    """Categorize VMAF score into quality buckets"""
-    if score >= 90:
-        return "Excellent (90+)"
-    elif score >= 74:
-        return "Good (74-90)"
-    elif score >= 58:
-        return "Fair (58-74)"
-    elif score >= 38:
-        return "Poor (38-58)"
+# Lower bounds of the quality buckets, ascending; a score equal to a bound belongs to the higher bucket
+QUALITY_THRESHOLDS = np.array([38, 58, 74, 90])
+QUALITY_BUCKETS = ["Bad (<38)", "Poor (38-58)", "Fair (58-74)", "Good (74-90)", "Excellent (90+)"]
+
+def count_quality_buckets(scores):
+    """Count VMAF scores per quality bucket, returned in QUALITY_BUCKETS order"""
+    bucket_indices = np.searchsorted(QUALITY_THRESHOLDS, scores, side='right')
+    return np.bincount(bucket_indices, minlength=len(QUALITY_BUCKETS))
+
+def score_statistics(scores):
+    """Compute min, max, mean and harmonic mean (0 unless every score is positive)"""
+    min_score = scores.min()
+    return {
+        'min': min_score,
+        'max': scores.max(),
+        'mean': scores.mean(),
+        'harmonic_mean': scores.size / np.reciprocal(scores).sum() if min_score > 0 else 0,
+    }
+
+def prepare_axes(ax, figsize):
+    """Return a cleared axes of the given figure size, reusing ax when provided"""
+    if ax is None:
+        _, ax = plt.subplots(figsize=figsize, layout='constrained')
     else:
-        return "Bad (<38)"
+        ax.clear()
+        ax.figure.set_size_inches(figsize)
+        ax.figure.set_layout_engine('constrained')
+    return ax
 
-def plot_histogram(scores, output_path, csv_path, vmaf_stats=None):
+def plot_histogram(scores, output_path, csv_path, vmaf_stats=None, ax=None):
     """Create histogram of VMAF scores by quality buckets and save CSV for sheets"""
-    buckets = {
-        "Excellent (90+)": 0,
-        "Good (74-90)": 0,
-        "Fair (58-74)": 0,
-        "Poor (38-58)": 0,
-        "Bad (<38)": 0
-    }
+    scores = np.asarray(scores, dtype=np.float64)
 
-    for score in scores:
-        bucket = get_quality_bucket(score)
-        buckets[bucket] += 1
+    # Display order is best to worst
+    counts = count_quality_buckets(scores)
+    buckets = {name: int(count) for name, count in zip(reversed(QUALITY_BUCKETS), counts[::-1])}
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    ax = prepare_axes(ax, (10, 6))
+    fig = ax.figure
 
     colors = ['#2ecc71', '#3498db', '#f39c12', '#e74c3c', '#c0392b']
     bars = ax.bar(buckets.keys(), buckets.values(), color=colors)
@@ -68,40 +89,41 @@ def plot_histogram(scores, output_path, csv_path, vmaf_stats=None):
     ax.set_ylabel('Number of Frames', fontsize=12)
     ax.set_title('VMAF Score Distribution by Quality Category', fontsize=14, fontweight='bold')
 
-    # Add value labels on bars
+    # Add value and percentage labels on bars
+    total_frames = sum(buckets.values())
     for bar, value in zip(bars, buckets.values()):
         height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height,
+        center_x = bar.get_x() + bar.get_width()/2.
+        ax.text(center_x, height,
                 f'{value:,}', ha='center', va='bottom', fontsize=10)
 
-    # Add percentage labels
-    total_frames = sum(buckets.values())
-    for bar, value in zip(bars, buckets.values()):
-        height = bar.get_height()
         percentage = (value / total_frames) * 100 if total_frames > 0 else 0
-        ax.text(bar.get_x() + bar.get_width()/2., height/2,
+        ax.text(center_x, height/2,
                 f'{percentage:.1f}%', ha='center', va='center',
                 fontsize=9, color='white', fontweight='bold')
 
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+    # Constrained layout already fits the labels, so no extra bbox measuring pass is needed
+    fig.savefig(output_path, dpi=100, pil_kwargs={'optimize': False, 'compress_level': 1})
     print(f"Histogram saved: {output_path}")
 
     # Create CSV file for Google Sheets
     with open(csv_path, 'w') as f:
         # Get statistics from JSON or calculate from scores
         if vmaf_stats:
-            min_score = vmaf_stats.get('min', np.min(scores))
-            max_score = vmaf_stats.get('max', np.max(scores))
-            mean_score = vmaf_stats.get('mean', np.mean(scores))
+            # Only scan the scores when the pooled metrics are incomplete
+            has_pooled = all(key in vmaf_stats for key in ('min', 'max', 'mean'))
+            computed = {} if has_pooled else score_statistics(scores)
+            min_score = vmaf_stats.get('min', computed.get('min'))
+            max_score = vmaf_stats.get('max', computed.get('max'))
+            mean_score = vmaf_stats.get('mean', computed.get('mean'))
             harmonic_mean_score = vmaf_stats.get('harmonic_mean', 0)
         else:
-            min_score = np.min(scores)
-            max_score = np.max(scores)
-            mean_score = np.mean(scores)
-            harmonic_mean_score = len(scores) / np.sum(1.0 / np.array(scores)) if all(s > 0 for s in scores) else 0
+            stats = score_statistics(scores)
+            min_score = stats['min']
+            max_score = stats['max']
+            mean_score = stats['mean']
+            harmonic_mean_score = stats['harmonic_mean']
 
         # Write header row with statistics and ranges
         f.write("Min\tMax\tMean\tHarmonic Mean\tBad (<38)\tPoor (38-58)\tFair (58-74)\tGood (74-90)\tExcellent (90+)\tTotal Frames\n")
@@ -119,11 +141,32 @@ def plot_histogram(scores, output_path, csv_path, vmaf_stats=None):
     print(f"CSV for Google Sheets saved: {csv_path}")
 
 
-def plot_frame_numbers(scores, frame_numbers, output_path):
-    """Create plot with frame numbers on x-axis and VMAF score on y-axis"""
-    fig, ax = plt.subplots(figsize=(14, 6))
+def decimate_series(frame_numbers, scores, bins):
+    """Reduce a series to per-bin x centers and min/mean/max envelopes"""
+    edges = np.linspace(0, len(scores), bins + 1).astype(np.intp)
+    starts = edges[:-1]
+    counts = np.diff(edges)
+    x_centers = np.add.reduceat(np.asarray(frame_numbers, dtype=np.float64), starts) / counts
+    mins = np.minimum.reduceat(scores, starts)
+    maxs = np.maximum.reduceat(scores, starts)
+    means = np.add.reduceat(scores, starts) / counts
+    return x_centers, mins, means, maxs
 
-    ax.plot(frame_numbers, scores, linewidth=1, color='#9b59b6', alpha=0.8)
+def plot_frame_numbers(scores, frame_numbers, output_path, ax=None):
+    """Create plot with frame numbers on x-axis and VMAF score on y-axis"""
+    scores = np.asarray(scores, dtype=np.float64)
+    dpi = 150
+    ax = prepare_axes(ax, (14, 6))
+    fig = ax.figure
+
+    # Beyond two points per pixel column the line overdraws itself; plot an envelope instead
+    max_points = int(fig.get_size_inches()[0] * dpi * 2)
+    if len(scores) > max_points:
+        x_centers, mins, means, maxs = decimate_series(frame_numbers, scores, max_points)
+        ax.fill_between(x_centers, mins, maxs, color='#9b59b6', alpha=0.3, linewidth=0)
+        ax.plot(x_centers, means, linewidth=1, color='#9b59b6', alpha=0.8)
+    else:
+        ax.plot(frame_numbers, scores, linewidth=1, color='#9b59b6', alpha=0.8)
 
     # Add quality threshold lines
     ax.axhline(y=90, color='#2ecc71', linestyle='--', alpha=0.5, label='Excellent (90+)')
@@ -139,55 +182,66 @@ def plot_frame_numbers(scores, frame_numbers, output_path):
     ax.legend(loc='lower right', fontsize=9)
 
     # Add statistics
-    avg_score = np.mean(scores)
-    min_score = np.min(scores)
-    max_score = np.max(scores)
+    avg_score = scores.mean()
+    min_score = scores.min()
+    max_score = scores.max()
     stats_text = f'Avg: {avg_score:.1f} | Min: {min_score:.1f} | Max: {max_score:.1f}'
     ax.text(0.02, 0.98, stats_text, transform=ax.transAxes,
             fontsize=10, verticalalignment='top',
             bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
 
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    fig.savefig(output_path, dpi=dpi, bbox_inches='tight')
     print(f"Frame number plot saved: {output_path}")
 
+def outputs_up_to_date(json_path, output_paths):
+    """Check whether every output exists and is at least as new as the JSON input"""
+    json_mtime = json_path.stat().st_mtime
+    return all(p.exists() and p.stat().st_mtime >= json_mtime for p in output_paths)
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python plot_vmaf.py <vmaf_json_file>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description='Plot VMAF analysis results from a JSON file')
+    parser.add_argument('vmaf_json_file', help='VMAF JSON results file')
+    parser.add_argument('--force', action='store_true',
+                        help='Regenerate outputs even if they are newer than the JSON file')
+    args = parser.parse_args()
 
-    json_path = Path(sys.argv[1])
+    json_path = Path(args.vmaf_json_file)
 
     if not json_path.exists():
         print(f"Error: File {json_path} not found")
         sys.exit(1)
 
+    # Generate output filenames in the same directory as the JSON
+    output_dir = json_path.parent
+    base_name = json_path.stem
+
+    histogram_path = output_dir / f"{base_name}_histogram.png"
+    frame_plot_path = output_dir / f"{base_name}_frames.png"
+    csv_path = output_dir / f"{base_name}_histogram.tsv"
+
+    if not args.force and outputs_up_to_date(json_path, (histogram_path, frame_plot_path, csv_path)):
+        print(f"Plots are up to date in: {output_dir} (use --force to regenerate)")
+        return
+
     print(f"Loading VMAF data from: {json_path}")
 
     try:
         scores, frame_numbers, vmaf_stats = load_vmaf_json(json_path)
 
-        if not scores:
+        if len(scores) == 0:
             print("Error: No VMAF scores found in the JSON file")
             sys.exit(1)
 
         print(f"Loaded {len(scores)} frames")
 
-        # Generate output filenames in the same directory as the JSON
-        output_dir = json_path.parent
-        base_name = json_path.stem
-
-        histogram_path = output_dir / f"{base_name}_histogram.png"
-        frame_plot_path = output_dir / f"{base_name}_frames.png"
-        csv_path = output_dir / f"{base_name}_histogram.tsv"
-
-        # Create plots
-        plot_histogram(scores, histogram_path, csv_path, vmaf_stats)
-        plot_frame_numbers(scores, frame_numbers, frame_plot_path)
+        # Create plots on one reused figure
+        fig, ax = plt.subplots(layout='constrained')
+        plot_histogram(scores, histogram_path, csv_path, vmaf_stats, ax=ax)
+        plot_frame_numbers(scores, frame_numbers, frame_plot_path, ax=ax)
+        plt.close(fig)
 
         print(f"\nAll plots generated successfully in: {output_dir}")
-        print(f"Average VMAF score: {np.mean(scores):.2f}")
+        print(f"Average VMAF score: {scores.mean():.2f}")
 
     except Exception as e:
         print(f"Error processing VMAF data: {e}")
@@ -0,0 +1,83 @@
+"""fp16 autocast must stay off the EasyOCR detector.
+
+EasyOCR thresholds the CRAFT detector's score maps with cv2.threshold,
+which rejects float16, so FrameNumberOCR only autocasts the recognizer.
+
+Run from scripts/vmaf with: python -m unittest discover tests
+"""
+import importlib.util
+import sys
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+HAS_OCR_DEPS = all(importlib.util.find_spec(name) for name in ('torch', 'easyocr'))
+
+
+class DetectorOutputThresholdTest(unittest.TestCase):
+    def test_float16_score_map_is_rejected(self):
+        # The dtype CRAFT produces under torch.autocast(dtype=float16)
+        score_text = np.random.default_rng(0).random((64, 64)).astype(np.float16)
+        with self.assertRaises(cv2.error):
+            cv2.threshold(score_text, 0.4, 1, 0)
+
+    def test_float32_score_map_is_accepted(self):
+        score_text = np.random.default_rng(0).random((64, 64)).astype(np.float32)
+        _, text_score = cv2.threshold(score_text, 0.4, 1, 0)
+        self.assertEqual(text_score.dtype, np.float32)
+
+
+@unittest.skipUnless(HAS_OCR_DEPS, "torch and easyocr are required")
+class FrameNumberOCRPrecisionTest(unittest.TestCase):
+    class FakeReader:
+        """Checks the autocast state each EasyOCR stage runs under."""
+        device = 'cuda'
+
+        def __init__(self):
+            import torch
+            self.torch = torch
+            self.detect_autocast = []
+            self.recognize_autocast = []
+
+        def detect(self, images, reformat=True):
+            self.detect_autocast.append(self.torch.is_autocast_enabled('cuda'))
+            # Same post-processing step EasyOCR applies to the detector output
+            score_text = np.zeros(images.shape[1:3], np.float32)
+            cv2.threshold(score_text, 0.4, 1, 0)
+            height, width = images.shape[1:3]
+            return [[[0, width, 0, height]] for _ in images], [[] for _ in images]
+
+        def recognize(self, image, horizontal_list=None, free_list=None, **kwargs):
+            self.recognize_autocast.append(self.torch.is_autocast_enabled('cuda'))
+            return [([[0, 0], [1, 0], [1, 1], [0, 1]], '42', 0.95)]
+
+    def test_only_recognizer_runs_under_autocast(self):
+        import video_sync_vmaf
+
+        reader = self.FakeReader()
+        ocr = video_sync_vmaf.FrameNumberOCR(reader, batch_size=2, half_precision=True)
+        frames = [np.full((40, 120, 3), 255, np.uint8), np.zeros((40, 120, 3), np.uint8)]
+
+        numbers = ocr.extract_frame_numbers_batched(frames)
+
+        self.assertEqual([number for number, _ in numbers], [42, 42])
+        self.assertEqual(reader.detect_autocast, [False])
+        self.assertEqual(reader.recognize_autocast, [True, True])
+
+    def test_warmup_failure_does_not_raise(self):
+        import video_sync_vmaf
+
+        reader = self.FakeReader()
+        reader.detect = lambda images, reformat=True: (_ for _ in ()).throw(RuntimeError("no cuDNN"))
+        ocr = video_sync_vmaf.FrameNumberOCR(reader, batch_size=2, half_precision=True)
+
+        with self.assertLogs(video_sync_vmaf.logger, 'WARNING'):
+            ocr.warmup_ocr(40, 120)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""The OCR region must still cover the counter when other bright pixels come first.
+
+Run from scripts/vmaf with: python -m unittest discover tests
+"""
+import importlib.util
+import queue
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+HAS_OCR_DEPS = all(importlib.util.find_spec(name) for name in ('torch', 'easyocr'))
+
+
+class CpuReader:
+    device = 'cpu'  # Skips the EasyOCR warmup
+
+
+class QueuedFrames:
+    """Stands in for a VideoReader that has already decoded every frame."""
+
+    def __init__(self, frames):
+        self.first_index = 0
+        self.queue = queue.Queue()
+        for frame_index, frame in enumerate(frames):
+            self.queue.put({'idx': frame_index, 'frame': frame})
+        self.queue.put(None)
+
+
+def frame_with_box(x0, x1, y0, y1):
+    frame = np.zeros((180, 320), np.uint8)
+    frame[y0:y1, x0:x1] = 255
+    return frame
+
+
+@unittest.skipUnless(HAS_OCR_DEPS, "torch and easyocr are required")
+class OCRRegionTest(unittest.TestCase):
+    def crops(self, frames, batch_size=4):
+        import video_sync_vmaf
+
+        ocr = video_sync_vmaf.FrameNumberOCR(CpuReader(), batch_size=batch_size)
+        return list(ocr.iter_cropped_frames(QueuedFrames(frames), threading.Event()))
+
+    def test_bright_frame_before_counter_keeps_counter_in_region(self):
+        flash = frame_with_box(0, 40, 0, 20)  # e.g. a logo or flash in the corner
+        counter = frame_with_box(150, 170, 80, 100)
+        crops = self.crops([np.zeros((180, 320), np.uint8), flash] + [counter] * 6)
+
+        self.assertIsNone(crops[0][1])
+        for _, crop in crops[2:]:
+            self.assertEqual(crop.ndim, 3)
+            self.assertTrue((crop == 255).any(), "counter pixels fell outside the OCR region")
+
+    def test_region_is_relocated_when_the_overlay_moves(self):
+        import video_sync_vmaf
+
+        left = frame_with_box(20, 40, 80, 100)
+        right = frame_with_box(280, 300, 80, 100)
+        frames = [left] * 4 + [right] * (video_sync_vmaf.ROI_MISS_LIMIT + 4)
+        crops = self.crops(frames)
+
+        self.assertEqual([index for index, _ in crops], list(range(len(frames))))
+        self.assertTrue((crops[-1][1] == 255).any())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,8 +20,8 @@ PREREQUISITES:
     docker pull gfdavila/easyvmaf
 
     # System requirements:
-    - Docker must be installed and running
-    - FFmpeg must be installed (for video trimming)
+    - Docker must be installed and running (not needed for --gpu with an ffmpeg built with libvmaf_cuda)
+    - FFmpeg and ffprobe must be installed (for frame decoding and video trimming)
     - Sufficient disk space for video processing
 
 USAGE:
@@ -43,6 +43,14 @@ ARGUMENTS:
     --debug: Optional flag to enable verbose debug logging
     --buffer: Buffer time in seconds after sync point (default: 5.0)
     --seek-distorted: Skip this many seconds when looking for numbered frames in distorted video (default: 0.0)
+    --easyocr-workers: Worker processes for the reference frame search, each loading its own EasyOCR reader (default: 1)
+    --easyocr-batch-size: Frames per batched EasyOCR call (default: 16)
+    --ocr-fp32: Run EasyOCR in full precision on CUDA instead of fp16 autocast
+    --ocr-fullres: Decode the OCR scans at full resolution instead of half scale
+    --accurate-trim: Re-encode the trimmed video for a frame-accurate cut (h264_nvenc when available, else libx264; WebM/Ogg inputs are written as .mkv)
+    --vmaf-threads: Threads libvmaf uses inside the easyVmaf container (default: CPU count)
+    --subsample: Score every Nth frame for a faster, approximate VMAF (default: 1, every frame)
+    --gpu: Score with the local ffmpeg's libvmaf_cuda filter, falling back to easyVmaf when it is unavailable
 
 OUTPUT:
     Creates a timestamped directory: vmaf_results_<distorted_name>_YYYYMMDD_HHMMSS/
@@ -55,6 +63,10 @@ OUTPUT:
     - Processing log file
     - Debug frames (if issues detected)
 
+    Reference frame positions found by OCR are also remembered in
+    ~/.cache/video_sync_vmaf/ (keyed by reference path, mtime and size), so reruns
+    against the same reference skip the reference scan.
+
 VIDEO REQUIREMENTS:
     - Reference video should have frame numbers visible (white text on black background)
     - Frame numbers should be clearly readable by OCR
@@ -84,14 +96,929 @@ import subprocess
 import sys
 import os
 import argparse
+import functools
+import hashlib
 import json
 import logging
+import multiprocessing
+import operator
+import queue
+import re
+import shutil
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, nullcontext
+from dataclasses import dataclass
+from fractions import Fraction
 from pathlib import Path
 from datetime import datetime
 import easyocr
+import torch
 
 logger = logging.getLogger(__name__)
 
+OCR_ALLOWLIST = '0123456789'
+OCR_BATCH_SIZE = 16  # Frames per batched EasyOCR detector pass
+OCR_DECODE_SCALE = 2  # Grayscale OCR scans are decoded at 1/2 width and height unless --ocr-fullres
+OVERLAY_WHITE_THRESHOLD = 200  # Frame-number digits are white on black
+ROI_MISS_LIMIT = 8  # Consecutive dark OCR crops, with overlay pixels elsewhere, before the region is relocated
+DOCKER_TAIL_LINES = 50  # Container output lines kept for failure reports
+FFMPEG_PROGRESS_PATTERN = re.compile(r'frame=\s*(\d+).*speed=\s*([\d.]+)')
+TRIM_KEYFRAME_INTERVAL = 1.0  # Seconds between keyframes when --accurate-trim re-encodes
+NON_H264_SUFFIXES = ('.webm', '.ogv', '.ogg')  # Containers that cannot carry the re-encoded H.264 trim
+FRAGMENTED_MP4_SUFFIXES = ('.mp4', '.m4v', '.mov')  # Trim outputs muxed as fragmented MP4
+KEYFRAME_SEEK_MARGIN = 0.001  # Seconds past a keyframe passed to -ss, well under one frame
+KEYFRAME_SEARCH_WINDOW = 10.0  # Seconds either side of the trim point searched for a keyframe
+FALLBACK_QUEUE_SIZE = 32  # Decoded frames buffered ahead of the fallback diff analysis
+TEMPLATE_MATCH_THRESHOLD = 0.7  # Below this, fall back to EasyOCR
+TEMPLATE_LEARN_CONFIDENCE = 0.9  # EasyOCR confidence needed to learn glyph templates
+DIGIT_TEMPLATE_SIZE = (24, 40)  # (width, height) every digit patch is normalized to
+RAWVIDEO_CHANNELS = {'bgr24': 3, 'gray': 1}  # Bytes per pixel of the pipe formats iter_frames supports
+FRAME_INDEX_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'video_sync_vmaf'
+
+def overlay_bounds(frames):
+    """Bounding box (x0, x1, y0, y1) of bright overlay pixels across frames, or None."""
+    mask = None
+    for frame in frames:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        _, bright = cv2.threshold(gray, OVERLAY_WHITE_THRESHOLD, 255, cv2.THRESH_BINARY)
+        mask = bright if mask is None else cv2.bitwise_or(mask, bright)
+
+    points = cv2.findNonZero(mask) if mask is not None else None
+    if points is None:
+        return None
+
+    x, y, w, h = cv2.boundingRect(points)
+    return x, x + w, y, y + h
+
+def expand_bounds(bounds, shape, pad_x, pad_y):
+    """Grow (x0, x1, y0, y1) by the given padding, clipped to a frame of the given shape."""
+    x0, x1, y0, y1 = bounds
+    height, width = shape[:2]
+    return max(0, x0 - pad_x), min(width, x1 + pad_x), max(0, y0 - pad_y), min(height, y1 + pad_y)
+
+class DigitTemplateMatcher:
+    """Classify overlay digits by template matching against glyphs learned from the video.
+
+    The overlay font depends on how the reference was rendered (drawtext with
+    a TrueType font or OpenCV's Hershey fallback), so templates are not
+    rasterized up front. Instead each confident EasyOCR read whose digit
+    contours line up with its text contributes the glyphs it contains.
+    Once all ten digits have templates, frames are classified by
+    normalized cross-correlation alone: the same score as
+    cv2.matchTemplate with TM_CCOEFF_NORMED on equal-sized patches, computed
+    for every patch of a batch against all ten templates in one matrix
+    product.
+    """
+
+    def __init__(self):
+        self.templates = {}
+        self.template_digits = None
+        self.template_matrix = None  # (10, pixels): zero-mean, unit-norm templates
+
+    @staticmethod
+    def normalize_patches(patches):
+        """Flatten patches to zero-mean, unit-norm float32 rows; flat patches become zero rows."""
+        rows = np.asarray(patches, dtype=np.float32).reshape(len(patches), -1)
+        rows -= rows.mean(axis=1, keepdims=True)
+        norms = np.linalg.norm(rows, axis=1, keepdims=True)
+        # A flat patch is all zeros after centering, so leaving it undivided keeps it zero
+        np.divide(rows, norms, out=rows, where=norms > 0)
+        return rows
+
+    @staticmethod
+    def digit_patches(frame):
+        """Split the thresholded overlay into normalized digit patches, left to right."""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        _, binary = cv2.threshold(gray, OVERLAY_WHITE_THRESHOLD, 255, cv2.THRESH_BINARY)
+        contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if not contours:
+            return []
+
+        boxes = sorted(cv2.boundingRect(contour) for contour in contours)
+        tallest = max(h for _, _, _, h in boxes)
+        # Drop specks left by compression noise; digits share the text height
+        return [cv2.resize(binary[y:y + h, x:x + w], DIGIT_TEMPLATE_SIZE, interpolation=cv2.INTER_AREA)
+                for x, y, w, h in boxes if h >= tallest // 2]
+
+    def learn(self, frame, number):
+        """Store glyph templates for the digits of a confidently recognized frame."""
+        text = str(number)
+        patches = self.digit_patches(frame)
+        if len(patches) != len(text):
+            return
+
+        for digit, patch in zip(text, patches):
+            if digit not in self.templates:
+                self.templates[digit] = patch
+                logger.debug("Learned template for digit %s (%d/10)", digit, len(self.templates))
+                if len(self.templates) == 10:
+                    self.template_digits = sorted(self.templates)
+                    self.template_matrix = self.normalize_patches([self.templates[d] for d in self.template_digits])
+
+    def classify(self, frame):
+        """Return (number, score) where score is the weakest per-digit match, or (None, 0.0)."""
+        return self.classify_batch([frame])[0]
+
+    def classify_batch(self, frames):
+        """classify() for a list of frames, scoring all their digit patches in one matrix product.
+
+        Nothing is classified until all ten digits have templates; otherwise an
+        unseen digit would be forced onto its closest known lookalike.
+        """
+        if self.template_matrix is None:
+            return [(None, 0.0)] * len(frames)
+
+        frame_patches = [self.digit_patches(frame) for frame in frames]
+        all_patches = [patch for patches in frame_patches for patch in patches]
+        if not all_patches:
+            return [(None, 0.0)] * len(frames)
+
+        scores = self.normalize_patches(all_patches) @ self.template_matrix.T
+        best = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(best)), best]
+
+        results = []
+        start = 0
+        for patches in frame_patches:
+            end = start + len(patches)
+            if patches:
+                number = int(''.join(self.template_digits[i] for i in best[start:end]))
+                results.append((number, min(1.0, float(best_scores[start:end].min()))))
+            else:
+                results.append((None, 0.0))
+            start = end
+        return results
+
+# PNG encoding and the distorted file copy are slow; both run off the analysis path
+_io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='io')
+
+def _write_image(path, image):
+    if not cv2.imwrite(str(path), image):
+        logger.warning(f"Failed to write image: {path}")
+
+def write_image_async(path, image):
+    """Queue image for writing to path; the caller must not modify image afterwards."""
+    return _io_pool.submit(_write_image, path, image)
+
+@functools.lru_cache(maxsize=32)
+def _probe_stream_info(video_path, mtime_ns, size):
+    """ffprobe video_path; mtime_ns and size only key the cache so a rewritten file is probed again."""
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_streams', '-show_format',
+        '-of', 'json',
+        video_path
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    info = json.loads(result.stdout)
+    stream = info['streams'][0]
+
+    rate = Fraction(stream.get('r_frame_rate', '0/1'))
+    if rate <= 0:
+        rate = Fraction(stream['avg_frame_rate'])
+    fps = float(rate)
+
+    total_frames = int(stream.get('nb_frames') or 0)
+    if total_frames <= 0:
+        duration = float(stream.get('duration') or info['format']['duration'])
+        total_frames = round(duration * fps)
+
+    return {'width': int(stream['width']), 'height': int(stream['height']),
+            'fps': fps, 'total_frames': total_frames}
+
+def probe_video(video_path):
+    """Return width, height, fps and total_frames of the first video stream, or None on failure.
+
+    Results are cached per file and modification time, since every step of
+    a run probes the same few files. Failures are not cached.
+    """
+    try:
+        path = Path(video_path).resolve()
+        stat = path.stat()
+        return dict(_probe_stream_info(str(path), stat.st_mtime_ns, stat.st_size))
+    except (subprocess.CalledProcessError, OSError, json.JSONDecodeError,
+            KeyError, IndexError, ValueError, ZeroDivisionError) as e:
+        logger.error(f"Could not probe video {video_path}: {e}")
+        return None
+
+def nearest_keyframe_time(video_path, time_sec, window=KEYFRAME_SEARCH_WINDOW):
+    """Return the video keyframe closest to time_sec, in seconds from the start, or None.
+
+    Only packets within window seconds either side of time_sec are read.
+    Packet timestamps are shifted by the container start time so the result
+    can be passed to ffmpeg -ss directly.
+    """
+    base_cmd = ['ffprobe', '-v', 'error', '-select_streams', 'v:0', '-of', 'json']
+
+    try:
+        # read_intervals takes absolute timestamps, so look up the container start time first
+        result = subprocess.run(base_cmd + ['-show_entries', 'format=start_time', str(video_path)],
+                                capture_output=True, text=True, check=True)
+        start_offset = float(json.loads(result.stdout)['format'].get('start_time') or 0.0)
+
+        interval = f"{start_offset + max(0.0, time_sec - window):.6f}%{start_offset + time_sec + window:.6f}"
+        result = subprocess.run(base_cmd + ['-show_entries', 'packet=pts_time,flags',
+                                            '-read_intervals', interval, str(video_path)],
+                                capture_output=True, text=True, check=True)
+        packets = json.loads(result.stdout).get('packets', [])
+        keyframes = [float(packet['pts_time']) - start_offset for packet in packets
+                     if 'K' in packet.get('flags', '') and packet.get('pts_time', 'N/A') != 'N/A']
+    except (subprocess.CalledProcessError, OSError, json.JSONDecodeError, KeyError, ValueError) as e:
+        logger.warning(f"Could not list keyframes of {video_path}: {e}")
+        return None
+
+    if not keyframes:
+        return None
+    return min(keyframes, key=lambda keyframe: abs(keyframe - time_sec))
+
+def iter_frames(video_path, width, height, start_sec=0.0, pix_fmt='bgr24', max_frames=None, scale=1):
+    """Yield frames of the first video stream decoded through an ffmpeg rawvideo pipe.
+
+    Frames are (height, width, 3) BGR arrays, or (height, width) arrays
+    when pix_fmt is 'gray', in which case ffmpeg converts to luma and the
+    pipe carries a third of the bytes. -ss is placed before -i so ffmpeg
+    seeks to the nearest keyframe and then decodes up to start_sec, which
+    keeps the first yielded frame exact. With max_frames, ffmpeg itself
+    stops after that many frames instead of decoding ahead into the pipe
+    until it is killed. With scale > 1, ffmpeg shrinks each dimension by
+    that factor before the pipe. Closing the generator terminates ffmpeg.
+    """
+    channels = RAWVIDEO_CHANNELS[pix_fmt]
+    width, height = max(1, width // scale), max(1, height // scale)
+    shape = (height, width, channels) if channels > 1 else (height, width)
+    cmd = ['ffmpeg', '-hide_banner', '-loglevel', 'error']
+    if start_sec > 0:
+        cmd += ['-ss', f'{start_sec:.6f}']
+    cmd += [
+        '-i', str(video_path),
+        '-map', '0:v:0',
+    ]
+    if max_frames is not None:
+        cmd += ['-frames:v', str(max_frames)]
+    if scale > 1:
+        cmd += ['-vf', f'scale={width}:{height}:flags=area']
+    cmd += [
+        '-f', 'rawvideo',
+        '-pix_fmt', pix_fmt,
+        '-fps_mode', 'passthrough',  # One output frame per decoded frame
+        'pipe:1'
+    ]
+
+    frame_size = width * height * channels
+    process = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL, bufsize=frame_size)
+    try:
+        while True:
+            # Read straight into an uninitialized array: no zero fill and no extra copy
+            frame = np.empty(shape, np.uint8)
+            if process.stdout.readinto(frame) < frame_size:
+                break
+            yield frame
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+class FramePipe:
+    """Random access to the frames of one video over a long-lived ffmpeg pipe.
+
+    read() reads forward from the running pipe when the requested frame is
+    at most max_skip frames ahead of it, and only restarts ffmpeg with a new
+    seek when going backward or further ahead. Between reads ffmpeg blocks
+    on the full pipe, so an idle pipe costs no CPU. close() kills it.
+    """
+
+    def __init__(self, video_path, video_info, max_skip=None):
+        self.video_path = video_path
+        self.video_info = video_info
+        self.max_skip = int(video_info['fps'] * 2) if max_skip is None else max_skip
+        self.frames = None
+        self.position = 0  # Index of the next frame the pipe will yield
+        self.spawns = 0
+
+    def read(self, frame_index):
+        """Return frame frame_index as a BGR array, or None past the end of the video."""
+        if self.frames is None or not 0 <= frame_index - self.position <= self.max_skip:
+            self.close()
+            self.frames = iter_frames(self.video_path, self.video_info['width'], self.video_info['height'],
+                                      frame_index / self.video_info['fps'])
+            self.position = frame_index
+            self.spawns += 1
+
+        frame = None
+        while self.position <= frame_index:
+            frame = next(self.frames, None)
+            if frame is None:
+                self.close()
+                return None
+            self.position += 1
+        return frame
+
+    def close(self):
+        if self.frames is not None:
+            self.frames.close()
+            self.frames = None
+
+def frame_index_cache_path(video_path):
+    """Sidecar file for video_path's frame index, keyed by resolved path, mtime and size."""
+    path = Path(video_path).resolve()
+    stat = path.stat()
+    key = f"{path}\0{stat.st_mtime_ns}\0{stat.st_size}"
+    return FRAME_INDEX_CACHE_DIR / f"{hashlib.sha1(key.encode()).hexdigest()}.json"
+
+def load_frame_index(video_path):
+    """Return the cached {frame_number: frame_index} map for video_path, or {} if there is none."""
+    try:
+        with open(frame_index_cache_path(video_path)) as f:
+            return {int(number): index for number, index in json.load(f).items()}
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError, AttributeError) as e:
+        logger.debug("Ignoring unreadable frame index cache for %s: %s", video_path, e)
+        return {}
+
+def store_frame_index(video_path, frame_number, frame_index):
+    """Record that frame_number first appears at frame_index in video_path."""
+    try:
+        cache_path = frame_index_cache_path(video_path)
+        frame_index_map = load_frame_index(video_path)
+        frame_index_map[frame_number] = frame_index
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so a concurrent run never reads a partial file
+        tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({str(number): index for number, index in sorted(frame_index_map.items())}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.debug("Could not update frame index cache for %s: %s", video_path, e)
+
+def put_unless_stopped(q, item, stop_event):
+    """Put item on a bounded queue, giving up once stop_event is set."""
+    while not stop_event.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def get_unless_stopped(q, stop_event):
+    """Get the next item from a queue, returning None once stop_event is set."""
+    while not stop_event.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return None
+
+class FrameDiffTracker:
+    """Track the largest change between consecutive frames in [first_index, end_index).
+
+    Frames are compared as luma at 1/8 scale: scene cuts survive the
+    downscale and each L1 diff touches 64x fewer pixels. Frames must be
+    observed in order; those outside the window are ignored.
+    """
+
+    def __init__(self, first_index, end_index, video_info):
+        self.first_index = first_index
+        self.end_index = end_index
+        self.fps = video_info['fps']
+        self.small_shape = (max(1, video_info['width'] // 8), max(1, video_info['height'] // 8))
+        # Preallocated downscale buffers; the two swap each frame
+        self.gray = np.empty((self.small_shape[1], self.small_shape[0]), dtype=np.uint8)
+        self.prev_gray = np.empty_like(self.gray)
+        self.frames_seen = 0
+        self.max_diff = 0
+        self.sync_frame = first_index
+
+    @property
+    def complete(self):
+        return self.frames_seen >= self.end_index - self.first_index
+
+    def observe(self, frame_index, frame):
+        if not self.first_index <= frame_index < self.end_index:
+            return
+
+        if frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        cv2.resize(frame, self.small_shape, dst=self.gray, interpolation=cv2.INTER_AREA)
+
+        if self.frames_seen:
+            diff_score = int(cv2.norm(self.gray, self.prev_gray, cv2.NORM_L1))
+            if diff_score > self.max_diff:
+                self.max_diff = diff_score
+                self.sync_frame = frame_index
+                logger.debug("New max difference at frame %d: %d", frame_index, diff_score)
+
+        self.gray, self.prev_gray = self.prev_gray, self.gray
+        self.frames_seen += 1
+
+class VideoReader(threading.Thread):
+    """Pull frames from a frame iterator on a background thread into a bounded queue.
+
+    Each item is {'idx': frame_index, 'frame': frame}; a None sentinel marks
+    the end of the range or of the video. Decoded frames are also offered to
+    on_frame(frame_index, frame) when it is given.
+    """
+
+    def __init__(self, frames, first_index, end_index, stop_event, maxsize=OCR_BATCH_SIZE, on_frame=None):
+        super().__init__(daemon=True)
+        self.frames = frames
+        self.first_index = first_index
+        self.end_index = end_index
+        self.stop_event = stop_event
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.on_frame = on_frame
+
+    def run(self):
+        with closing(self.frames):
+            for frame_index, frame in zip(range(self.first_index, self.end_index), self.frames):
+                if self.on_frame is not None:
+                    self.on_frame(frame_index, frame)
+                if not put_unless_stopped(self.queue, {'idx': frame_index, 'frame': frame}, self.stop_event):
+                    break
+        put_unless_stopped(self.queue, None, self.stop_event)
+
+@functools.lru_cache(maxsize=1)
+def h264_encoder():
+    """Return 'h264_nvenc' when this ffmpeg build has CUDA and NVENC, otherwise 'libx264'."""
+    try:
+        hwaccels = subprocess.run(['ffmpeg', '-hide_banner', '-hwaccels'],
+                                  capture_output=True, text=True, check=True).stdout
+        encoders = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'],
+                                  capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return 'libx264'
+    if 'cuda' in hwaccels.split() and 'h264_nvenc' in encoders:
+        return 'h264_nvenc'
+    return 'libx264'
+
+@functools.lru_cache(maxsize=None)
+def ffmpeg_has_filter(name):
+    """Whether the local ffmpeg build provides the named filter."""
+    try:
+        filters = subprocess.run(['ffmpeg', '-hide_banner', '-filters'],
+                                 capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return False
+    return any(line.split()[1:2] == [name] for line in filters.splitlines())
+
+@functools.lru_cache(maxsize=1)
+def get_ocr_reader(gpu=True):
+    """Create the EasyOCR reader once per process.
+
+    Model loading and the weight upload to the GPU take seconds, so repeated
+    VideoSyncVMAF instances share one reader. On GPU a dummy batch is run
+    right away so CUDA initialization is not charged to the first scan.
+    """
+    reader = easyocr.Reader(['en'], gpu=gpu, cudnn_benchmark=True)
+    if reader.device != 'cpu':
+        dummy = np.zeros((OCR_BATCH_SIZE, 64, 256, 3), np.uint8)
+        reader.readtext_batched(dummy, batch_size=OCR_BATCH_SIZE, allowlist=OCR_ALLOWLIST)
+    return reader
+
+class FrameNumberOCR:
+    """Read the frame-number overlay from frames with template matching and EasyOCR.
+
+    Holds no per-run state besides learned digit templates, so worker
+    processes can build their own instance around their own reader.
+    """
+
+    def __init__(self, reader, batch_size=OCR_BATCH_SIZE, half_precision=True, decode_scale=OCR_DECODE_SCALE):
+        self.ocr_reader = reader
+        self.batch_size = batch_size
+        self.half_precision = half_precision
+        self.decode_scale = decode_scale
+        self.digit_matcher = DigitTemplateMatcher()
+
+    def precision(self):
+        """Context for EasyOCR recognizer passes: fp16 autocast on CUDA, otherwise unchanged.
+
+        Only the recognizer runs under it. The CRAFT detector's score maps
+        go to cv2.threshold, which rejects float16, so detection stays fp32.
+        CPU readers already use EasyOCR's int8 dynamic quantization
+        (quantize=True by default), and MPS is left alone because half
+        precision there has produced garbage text.
+        """
+        if self.half_precision and str(self.ocr_reader.device).startswith('cuda'):
+            return torch.autocast('cuda', dtype=torch.float16)
+        return nullcontext()
+
+    @staticmethod
+    def best_digit_result(results):
+        """Pick the highest-confidence EasyOCR result and return (number, confidence)."""
+        if results:
+            bbox, text, confidence = max(results, key=lambda x: x[2])
+            logger.debug("EasyOCR extracted: '%s' (conf: %.3f)", text, confidence)
+            if text.isdigit():
+                return int(text), confidence
+        return None, 0.0
+
+    def recognize_overlay(self, frame):
+        """Run EasyOCR recognition on the overlay box of a single frame.
+
+        The box is located by thresholding, so the CRAFT detection pass is
+        skipped entirely. Returns EasyOCR results, empty when the frame has
+        no bright pixels.
+        """
+        bounds = overlay_bounds([frame])
+        if bounds is None:
+            return []
+
+        margin = (bounds[3] - bounds[2]) // 4
+        x0, x1, y0, y1 = expand_bounds(bounds, frame.shape, margin, margin)
+        with self.precision():
+            return self.ocr_reader.recognize(frame, horizontal_list=[[x0, x1, y0, y1]], free_list=[],
+                                             allowlist=OCR_ALLOWLIST)
+
+    def read_batch(self, frames):
+        """EasyOCR detection and recognition for same-sized frames, returning one result list per frame.
+
+        Equivalent to readtext_batched, except that only recognition runs
+        under precision(): detection is batched across frames in fp32.
+        """
+        horizontal_lists, free_lists = self.ocr_reader.detect(np.stack(frames), reformat=False)
+        with self.precision():
+            return [self.ocr_reader.recognize(frame, horizontal_list=horizontal_list, free_list=free_list,
+                                              batch_size=self.batch_size, allowlist=OCR_ALLOWLIST)
+                    for frame, horizontal_list, free_list in zip(frames, horizontal_lists, free_lists)]
+
+    def warmup_ocr(self, height, width):
+        """Run one dummy batch at the OCR region size so cuDNN autotunes it before the scan."""
+        if self.ocr_reader.device == 'cpu':
+            return
+        dummy = [np.zeros((height, width, 3), np.uint8)] * self.batch_size
+        try:
+            self.read_batch(dummy)
+        except Exception as e:
+            # Only a speedup; the scan itself reports real OCR failures
+            logger.warning(f"EasyOCR warmup failed, continuing without it: {e}")
+
+    def match_or_learn(self, frame, frame_number, confidence):
+        """Feed a confident EasyOCR read to the template matcher and pass the result through."""
+        if frame_number is not None and confidence >= TEMPLATE_LEARN_CONFIDENCE:
+            self.digit_matcher.learn(frame, frame_number)
+        return frame_number, confidence
+
+    def extract_frame_numbers_batched(self, frames):
+        """Extract frame numbers from same-sized frames.
+
+        Frames are classified by template matching first; only those scoring
+        below TEMPLATE_MATCH_THRESHOLD go to a single batched EasyOCR call.
+        """
+        numbers = self.digit_matcher.classify_batch(frames)
+        pending = [i for i, (number, score) in enumerate(numbers) if score < TEMPLATE_MATCH_THRESHOLD]
+        if not pending:
+            return numbers
+
+        try:
+            batch_results = self.read_batch([frames[i] for i in pending])
+        except Exception as e:
+            logger.warning(f"EasyOCR batched extraction failed: {e}")
+            for i in pending:
+                numbers[i] = (None, 0.0)
+            return numbers
+
+        for i, results in zip(pending, batch_results):
+            numbers[i] = self.match_or_learn(frames[i], *self.best_digit_result(results))
+        return numbers
+
+    def ocr_frames(self, items):
+        """OCR (idx, frame) items in one batch; frames set to None have no overlay and are skipped."""
+        numbers = [(None, 0.0)] * len(items)
+        present = [i for i, (_, frame) in enumerate(items) if frame is not None]
+        if present:
+            for i, result in zip(present, self.extract_frame_numbers_batched([items[i][1] for i in present])):
+                numbers[i] = result
+        return [(idx, number, confidence) for (idx, _), (number, confidence) in zip(items, numbers)]
+
+    def iter_cropped_frames(self, reader, stop_event):
+        """Yield (frame_index, crop) for decoded frames, cropped to the OCR region.
+
+        The region is the union of the overlay pixels in the first
+        batch_size frames that have any, padded horizontally so the
+        centered counter can grow by a few digits; a single bright
+        non-counter frame therefore cannot hide the counter from the whole
+        scan. If ROI_MISS_LIMIT crops in a row come out dark while their
+        frames still have overlay pixels elsewhere, the region is located
+        again. Frames with no bright pixels before the region is known are
+        yielded as None. Grayscale frames are expanded to three channels
+        only within the crop, and every crop is a copy so the full decoded
+        frame can be freed.
+        """
+        def crop(frame):
+            x0, x1, y0, y1 = roi
+            region = frame[y0:y1, x0:x1]
+            return cv2.cvtColor(region, cv2.COLOR_GRAY2BGR) if region.ndim == 2 else region.copy()
+
+        roi = None
+        pending = []  # (frame_index, frame or None) decoded while the region is being located
+        bright_frames = 0
+        misses = 0
+        while (item := get_unless_stopped(reader.queue, stop_event)) is not None:
+            frame_index, frame = item['idx'], item['frame']
+
+            if roi is not None:
+                cropped = crop(frame)
+                if overlay_bounds([cropped]) is None and overlay_bounds([frame]) is not None:
+                    misses += 1
+                else:
+                    misses = 0
+                if misses < ROI_MISS_LIMIT:
+                    yield frame_index, cropped
+                    continue
+                logger.debug("Overlay left the OCR region at frame %d, locating it again", frame_index)
+                roi, bright_frames, misses = None, 0, 0
+
+            has_overlay = overlay_bounds([frame]) is not None
+            pending.append((frame_index, frame if has_overlay else None))
+            bright_frames += has_overlay
+            if bright_frames < self.batch_size:
+                continue
+
+            roi = self.locate_ocr_region([frame for _, frame in pending if frame is not None])
+            yield from ((index, None if frame is None else crop(frame)) for index, frame in pending)
+            pending = []
+
+        # The video ended before batch_size frames with overlay pixels were seen
+        if bright_frames and roi is None:
+            roi = self.locate_ocr_region([frame for _, frame in pending if frame is not None])
+        yield from ((index, None if frame is None else crop(frame)) for index, frame in pending)
+
+    def locate_ocr_region(self, frames):
+        """OCR region around the union of the frames' overlay pixels; warms EasyOCR up at its size."""
+        bounds = overlay_bounds(frames)
+        text_height = bounds[3] - bounds[2]
+        roi = expand_bounds(bounds, frames[0].shape, 2 * text_height, text_height // 2)
+        logger.debug("OCR region (x0, x1, y0, y1): %s", roi)
+        self.warmup_ocr(roi[3] - roi[2], roi[1] - roi[0])
+        return roi
+
+    def iter_sample_chunks(self, reader, stop_event, stride):
+        """Group cropped frames into chunks of up to batch_size (gap, sample) pairs.
+
+        Every stride-th frame is a sample; the frames decoded since the
+        previous sample form its gap. A trailing gap is paired with None.
+        Frames come from iter_cropped_frames.
+        """
+        chunk, gap = [], []
+        for frame_index, frame in self.iter_cropped_frames(reader, stop_event):
+            if (frame_index - reader.first_index) % stride:
+                gap.append((frame_index, frame))
+                continue
+
+            chunk.append((gap, (frame_index, frame)))
+            gap = []
+            if len(chunk) == self.batch_size:
+                yield chunk
+                chunk = []
+
+        if gap:
+            chunk.append((gap, None))
+        if chunk:
+            yield chunk
+
+    def run_ocr_stage(self, reader, results, stop_event, stride, needs_refine):
+        """OCR sampled frames in batches and push (idx, number, conf) results in frame order.
+
+        Sampled frames are recognized batch_size at a time. The frames in
+        a gap are only recognized when needs_refine(previous_number, number)
+        says the transition being searched for may lie between the two
+        samples around it.
+        """
+        try:
+            previous_number = None
+            for chunk in self.iter_sample_chunks(reader, stop_event, stride):
+                samples = self.ocr_frames([sample for _, sample in chunk if sample is not None])
+                for (gap, sample), sample_result in zip(chunk, samples + [None]):
+                    entries = []
+                    if gap and (sample_result is None or needs_refine(previous_number, sample_result[1])):
+                        entries.extend(self.ocr_frames(gap))
+                    if sample_result is not None:
+                        entries.append(sample_result)
+                        previous_number = sample_result[1]
+
+                    for entry in entries:
+                        if not put_unless_stopped(results, entry, stop_event):
+                            return
+        finally:
+            put_unless_stopped(results, None, stop_event)
+
+    def iter_frame_numbers(self, video_path, video_info, first_index, end_index,
+                           stride=1, needs_refine=operator.ne, on_frame=None):
+        """Yield (frame_index, frame_number, confidence) for frames of video_path.
+
+        Decoding, batched OCR and result inspection run as a pipeline: a
+        VideoReader thread decodes into a bounded queue, an OCR thread
+        recognizes batch_size frames per EasyOCR call, and the caller
+        consumes results. With stride > 1 only every stride-th frame is
+        recognized unless needs_refine asks for the frames in between (see
+        run_ocr_stage), so yielded indices may skip. Frames are decoded as
+        grayscale, shrunk by decode_scale; on_frame sees every decoded frame
+        on the decode thread. Iteration stops at end_index or at the end of
+        the video; closing the generator stops both threads.
+        """
+        stop_event = threading.Event()
+        results = queue.Queue(maxsize=self.batch_size)
+        frames = iter_frames(video_path, video_info['width'], video_info['height'],
+                             first_index / video_info['fps'],
+                             pix_fmt='gray', max_frames=max(0, end_index - first_index),
+                             scale=self.decode_scale)
+        reader = VideoReader(frames, first_index, end_index, stop_event, maxsize=self.batch_size,
+                             on_frame=on_frame)
+        ocr_thread = threading.Thread(target=self.run_ocr_stage, args=(reader, results, stop_event, stride, needs_refine),
+                                      daemon=True)
+        reader.start()
+        ocr_thread.start()
+
+        try:
+            while (item := results.get()) is not None:
+                yield item
+        finally:
+            stop_event.set()
+            ocr_thread.join()
+            reader.join()
+
+    def extract_frame_number_with_confidence(self, frame):
+        """Extract frame number from a frame, returning both number and confidence.
+
+        Template matching is tried first; EasyOCR runs only when it is unsure.
+        """
+        if frame is None:
+            return None, 0.0
+
+        frame_number, score = self.digit_matcher.classify(frame)
+        if score >= TEMPLATE_MATCH_THRESHOLD:
+            logger.debug("Template match: %s (score: %.3f)", frame_number, score)
+            return frame_number, score
+
+        try:
+            # Use EasyOCR recognition on the overlay box with digit allowlist
+            results = self.recognize_overlay(frame)
+            return self.match_or_learn(frame, *self.best_digit_result(results))
+
+        except Exception as e:
+            logger.warning(f"EasyOCR extraction failed: {e}")
+            return None, 0.0
+
+def may_contain_target(target_frame_number, previous_number, number):
+    """Whether the reference scan must OCR the gap between two sampled numbers."""
+    if previous_number is None or number is None:
+        return previous_number != number
+    return min(previous_number, number) < target_frame_number <= max(previous_number, number)
+
+def scan_for_target(ocr, video_path, video_info, first_index, end_index, target_frame_number, stride):
+    """Return the first frame index in [first_index, end_index) showing target_frame_number, or None."""
+    fps = video_info['fps']
+    name = Path(video_path).name
+    needs_refine = functools.partial(may_contain_target, target_frame_number)
+    log_frames = logger.isEnabledFor(logging.DEBUG)
+    summary_interval = max(1, int(fps))
+    next_summary = first_index
+
+    with closing(ocr.iter_frame_numbers(video_path, video_info, first_index, end_index,
+                                        stride, needs_refine)) as frame_numbers:
+        for frame_count, detected_number, _ in frame_numbers:
+            # Log every frame for debugging; INFO gets about one line per second of video
+            if log_frames:
+                logger.debug("[%s] Frame %d at %.3fs: %s", name, frame_count, frame_count / fps,
+                             detected_number if detected_number else 'no number')
+            if frame_count >= next_summary:
+                logger.info("[%s] Scanned to frame %d (%.1fs): %s", name, frame_count, frame_count / fps,
+                            detected_number if detected_number else 'no number')
+                next_summary = frame_count + summary_interval
+
+            if detected_number == target_frame_number:
+                logger.info(f"✓ Found target frame {target_frame_number} at frame {frame_count} ({frame_count / fps:.3f}s) in {name}")
+                return frame_count
+
+    return None
+
+def bisect_for_target(ocr, pipe, first_index, end_index, target_frame_number):
+    """Binary search [first_index, end_index) for the first frame showing target_frame_number.
+
+    The reference counter increases with the frame index, so each probe
+    decodes and recognizes a single frame instead of the whole range. Probes
+    read through pipe, so the closely spaced ones near convergence share one
+    ffmpeg process. A probe without a readable number is treated as past
+    the counter, as in marked content where a numbered prefix is followed
+    by unnumbered video. Returns (frame_index, frame), or None when the
+    boundary frame does not verify; the caller then falls back to a linear
+    scan.
+    """
+    fps = pipe.video_info['fps']
+    name = Path(pipe.video_path).name
+    probes = {}
+    spawns = pipe.spawns
+
+    def read_number(frame_index):
+        if frame_index not in probes:
+            frame = pipe.read(frame_index)
+            number = None if frame is None else ocr.extract_frame_number_with_confidence(frame)[0]
+            logger.debug("[%s] Probe frame %d: %s", name, frame_index, number if number is not None else 'no number')
+            probes[frame_index] = (number, frame)
+        return probes[frame_index][0]
+
+    lo, hi = first_index, end_index
+    while lo < hi:
+        mid = (lo + hi) // 2
+        number = read_number(mid)
+        if number is not None and number < target_frame_number:
+            lo = mid + 1
+        else:
+            hi = mid
+
+    # A misread probe can steer the search wrong, so check both sides of the boundary,
+    # the earlier one first so the pipe keeps reading forward
+    if lo >= end_index:
+        return None
+    if lo > first_index and (previous := read_number(lo - 1)) is not None and previous >= target_frame_number:
+        return None
+    if read_number(lo) != target_frame_number:
+        return None
+
+    logger.info(f"✓ Found target frame {target_frame_number} at frame {lo} ({lo / fps:.3f}s) in {name} "
+                f"after {len(probes)} probes ({pipe.spawns - spawns} ffmpeg starts)")
+    return lo, probes[lo][1]
+
+_worker_ocr = None
+
+def init_ocr_worker(batch_size, half_precision, decode_scale, cpu_slice_queue=None):
+    """Pool initializer: give each worker process its own EasyOCR reader.
+
+    With cpu_slice_queue, the worker first takes one CPU set from it and
+    pins itself, and sizes the torch and OpenCV thread pools to that set,
+    before the reader is loaded. The ffmpeg decoders it spawns inherit the
+    affinity, so concurrent workers do not migrate across each other's
+    cores (or NUMA nodes).
+    """
+    global _worker_ocr
+    if cpu_slice_queue is not None:
+        cpus = cpu_slice_queue.get()
+        os.sched_setaffinity(0, cpus)
+        torch.set_num_threads(len(cpus))
+        cv2.setNumThreads(len(cpus))
+    _worker_ocr = FrameNumberOCR(get_ocr_reader(), batch_size, half_precision, decode_scale)
+
+def cpu_slices(count):
+    """Split the CPUs this process may run on into count disjoint sets, or None where unsupported.
+
+    Returns None on platforms without sched_setaffinity and when there are
+    fewer CPUs than slices.
+    """
+    if not hasattr(os, 'sched_setaffinity'):
+        return None
+    cpus = sorted(os.sched_getaffinity(0))
+    if len(cpus) < count:
+        return None
+    return [set(cpus[slice_index * len(cpus) // count:(slice_index + 1) * len(cpus) // count])
+            for slice_index in range(count)]
+
+def scan_reference_segment(task):
+    """Pool task: scan one segment of the reference video for the target frame number."""
+    segment, video_path, video_info, first_index, end_index, target_frame_number, stride = task
+    return segment, scan_for_target(_worker_ocr, video_path, video_info, first_index, end_index,
+                                    target_frame_number, stride)
+
+def earliest_settled_match(segment_results, segment_count):
+    """Earliest match once every segment before it has reported, else None."""
+    for segment in range(segment_count):
+        if segment not in segment_results:
+            return None
+        if segment_results[segment] is not None:
+            return segment_results[segment]
+    return None
+
+def drain_docker_output(stream, tail, log_interval=1.0, source='Docker'):
+    """Read a container's output to the end, keeping the last lines in tail.
+
+    FFmpeg progress lines arrive many times per second, so they are logged
+    at most once per log_interval; every other line is logged as it comes.
+    Log lines are prefixed with source.
+    """
+    last_progress_log = 0.0
+    line_count = 0
+    for line in stream:
+        line_count += 1
+        line = line.strip()
+        if not line:
+            continue
+        tail.append(line)
+
+        progress = FFMPEG_PROGRESS_PATTERN.search(line)
+        if progress is None:
+            logger.info(f"{source}: {line}")
+        elif time.monotonic() - last_progress_log >= log_interval:
+            last_progress_log = time.monotonic()
+            logger.info(f"{source} progress: frame {progress[1]}, speed {progress[2]}x")
+
+    logger.info(f"{source} output: {line_count} lines processed")
+
 def setup_logging(log_file_path, debug=False):
     """Setup logging to both console and file."""
     # Clear any existing handlers
@@ -118,12 +1045,40 @@ def setup_logging(log_file_path, debug=False):
     # Prevent propagation to root logger to avoid duplicate messages
     logger.propagate = False
 
+class VMAFError(Exception):
+    """An input or environment problem that stops the run with a message instead of a traceback."""
+
+@dataclass(frozen=True, slots=True)
+class SyncConfig:
+    """Settings for one VideoSyncVMAF run; main() builds it from the command line."""
+    reference: str
+    distorted: str
+    buffer_seconds: float = 5.0
+    seek_distorted: float = 0.0
+    easyocr_workers: int = 1
+    easyocr_batch_size: int = OCR_BATCH_SIZE
+    ocr_fp16: bool = True
+    ocr_fullres: bool = False
+    accurate_trim: bool = False
+    vmaf_threads: int | None = None  # None uses every CPU
+    vmaf_subsample: int = 1
+    vmaf_gpu: bool = False
+
 class VideoSyncVMAF:
-    def __init__(self, reference_path, distorted_path, buffer_seconds=5.0, seek_distorted=0.0):
-        self.reference_path = Path(reference_path)
-        self.distorted_path = Path(distorted_path)
-        self.buffer_seconds = buffer_seconds
-        self.seek_distorted = seek_distorted
+    def __init__(self, config):
+        self.config = config
+        self.reference_path = Path(config.reference)
+        self.distorted_path = Path(config.distorted)
+        self.buffer_seconds = config.buffer_seconds
+        self.seek_distorted = config.seek_distorted
+        self.easyocr_workers = max(1, config.easyocr_workers)
+        self.easyocr_batch_size = max(1, config.easyocr_batch_size)
+        self.ocr_fp16 = config.ocr_fp16
+        self.ocr_decode_scale = 1 if config.ocr_fullres else OCR_DECODE_SCALE
+        self.accurate_trim = config.accurate_trim
+        self.vmaf_threads = config.vmaf_threads or os.cpu_count() or 1
+        self.vmaf_subsample = max(1, config.vmaf_subsample)
+        self.vmaf_gpu = config.vmaf_gpu
 
         # Create timestamped directory for results with distorted filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -131,8 +1086,11 @@ class VideoSyncVMAF:
         self.results_dir = Path(f"vmaf_results_{distorted_name}_{timestamp}")
         self.results_dir.mkdir(exist_ok=True)
 
-        # Set paths within the timestamped directory - preserve original format
+        # Set paths within the timestamped directory - preserve original format, unless the
+        # --accurate-trim re-encode writes H.264 that the original container cannot hold
         original_suffix = self.distorted_path.suffix
+        if self.accurate_trim and original_suffix.lower() in NON_H264_SUFFIXES:
+            original_suffix = '.mkv'
         self.trimmed_path = self.results_dir / f"{self.distorted_path.stem}-trimmed{original_suffix}"
         self.results_log = self.results_dir / "results.log"
 
@@ -145,6 +1103,10 @@ class VideoSyncVMAF:
             raise FileNotFoundError(f"Reference video not found: {self.reference_path}")
         if not self.distorted_path.exists():
             raise FileNotFoundError(f"Distorted video not found: {self.distorted_path}")
+        # Probes are cached, so this early check costs the later steps nothing
+        for path in (self.reference_path, self.distorted_path):
+            if probe_video(path) is None:
+                raise VMAFError(f"Not a readable video: {path}")
 
         logger.info(f"Reference video: {self.reference_path}")
         logger.info(f"Distorted video: {self.distorted_path}")
@@ -152,184 +1114,154 @@ class VideoSyncVMAF:
         logger.info(f"Results log: {self.results_log}")
         logger.info(f"Buffer time: {self.buffer_seconds}s")
         logger.info(f"Seek distorted: {self.seek_distorted}s")
+        logger.info(f"Trim mode: {'re-encode (frame accurate)' if self.accurate_trim else 'stream copy'}")
+        logger.info(f"VMAF threads: {self.vmaf_threads}, subsample: every {self.vmaf_subsample} frame(s)"
+                    f"{', libvmaf_cuda' if self.vmaf_gpu else ''}")
+        logger.info(f"EasyOCR workers: {self.easyocr_workers}, batch size: {self.easyocr_batch_size}, "
+                    f"fp16 on CUDA: {self.ocr_fp16}, scan scale: 1/{self.ocr_decode_scale}")
 
         # Initialize EasyOCR reader
         logger.info("Initializing EasyOCR...")
-        self.ocr_reader = easyocr.Reader(['en'])
-
-    def extract_frame_number(self, frame):
-        """Extract frame number from a frame using EasyOCR."""
-        if frame is None:
-            return None
-
-        try:
-            # Use EasyOCR with digit allowlist
-            results = self.ocr_reader.readtext(frame, allowlist='0123456789')
-
-            if results:
-                # Take the result with highest confidence
-                best_result = max(results, key=lambda x: x[2])
-                bbox, text, confidence = best_result
-
-                logger.debug(f"EasyOCR extracted: '{text}' (conf: {confidence:.3f})")
-
-                if text.isdigit():
-                    logger.debug(f"Successfully extracted number: {int(text)}")
-                    return int(text)
+        self.ocr_reader = get_ocr_reader()
+        self.ocr = FrameNumberOCR(self.ocr_reader, self.easyocr_batch_size, self.ocr_fp16, self.ocr_decode_scale)
 
-            # If OCR fails, save the frame for debugging
-            debug_path = self.results_dir / f"debug_frame_{hash(frame.tobytes()) % 10000}.png"
-            cv2.imwrite(str(debug_path), frame)
-            logger.debug(f"EasyOCR failed, saved debug frame: {debug_path}")
-
-            return None
-
-        except Exception as e:
-            logger.warning(f"EasyOCR extraction failed: {e}")
-            return None
-
-    def extract_frame_number_with_confidence(self, frame):
-        """Extract frame number from a frame using EasyOCR, returning both number and confidence."""
-        if frame is None:
-            return None, 0.0
-
-        try:
-            # Use EasyOCR with digit allowlist
-            results = self.ocr_reader.readtext(frame, allowlist='0123456789')
-
-            if results:
-                # Take the result with highest confidence
-                best_result = max(results, key=lambda x: x[2])
-                bbox, text, confidence = best_result
-
-                logger.debug(f"EasyOCR extracted: '{text}' (conf: {confidence:.3f})")
-
-                if text.isdigit():
-                    logger.debug(f"Successfully extracted number: {int(text)} with confidence {confidence:.3f}")
-                    return int(text), confidence
-
-            return None, 0.0
-
-        except Exception as e:
-            logger.warning(f"EasyOCR extraction failed: {e}")
-            return None, 0.0
+        # Full-size reference frames already decoded by position, reused when saving validation frames
+        self._ref_frames = {}
+        # Shared ffmpeg pipe for single reference frames, opened on first use and closed by process()
+        self._ref_pipe = None
 
     def find_sync_point(self, video_path):
         """Find the timestamp where frame number changes with both numbers detected at >50% confidence."""
         logger.info(f"Analyzing video for sync point: {video_path}")
 
-        cap = cv2.VideoCapture(str(video_path))
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        video_info = probe_video(video_path)
+        if video_info is None:
+            return None
+
+        fps = video_info['fps']
+        total_frames = video_info['total_frames']
         duration = total_frames / fps
 
         logger.info(f"Video properties - FPS: {fps:.2f}, Total frames: {total_frames}, Duration: {duration:.2f}s")
 
         # Skip to seek position if specified
+        seek_frame = max(0, int(self.seek_distorted * fps))
         if self.seek_distorted > 0:
-            seek_frame = int(self.seek_distorted * fps)
-            cap.set(cv2.CAP_PROP_POS_FRAMES, seek_frame)
             logger.info(f"Seeking to {self.seek_distorted}s (frame {seek_frame})")
 
-        frame_count = int(self.seek_distorted * fps) if self.seek_distorted > 0 else 0
+        frame_count = seek_frame
+        # Don't analyze more than 30 seconds from seek point
+        end_frame = int((self.seek_distorted + 30) * fps) + 1
+        log_frames = logger.isEnabledFor(logging.DEBUG)
+        # Per-frame lines are debug output; INFO gets about one progress line per second of video
+        summary_interval = max(1, int(fps))
+        next_summary = frame_count
         last_frame_number = None
         last_confidence = None
         sync_timestamp = None
 
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            current_time = frame_count / fps
-            frame_number, confidence = self.extract_frame_number_with_confidence(frame)
-
-            # Log every frame being analyzed
-            if frame_number is not None:
-                logger.info(f"Frame {frame_count} at {current_time:.3f}s: {frame_number} (conf: {confidence:.3f})")
+        # Only frames around a change in the sampled numbers are recognized one by one
+        stride = max(1, int(fps / 10))
+
+        # The fallback's frame differences are gathered from this same decode
+        diff_tracker = self.fallback_diff_tracker(video_info)
+
+        with closing(self.ocr.iter_frame_numbers(video_path, video_info, frame_count, end_frame, stride,
+                                                 on_frame=diff_tracker.observe)) as frame_numbers:
+            for frame_count, frame_number, confidence in frame_numbers:
+                # Log every frame being analyzed
+                if log_frames:
+                    if frame_number is not None:
+                        logger.debug("Frame %d at %.3fs: %s (conf: %.3f)", frame_count, frame_count / fps, frame_number, confidence)
+                    else:
+                        logger.debug("Frame %d at %.3fs: no number detected", frame_count, frame_count / fps)
+                if frame_count >= next_summary:
+                    logger.info("Scanned to frame %d (%.1fs): %s", frame_count, frame_count / fps,
+                                frame_number if frame_number is not None else 'no number detected')
+                    next_summary = frame_count + summary_interval
+
+                # Only consider detections with confidence > 50%
+                if frame_number is not None and confidence > 0.5:
+                    # Check for frame number change with both having high confidence
+                    if (last_frame_number is not None and last_confidence is not None and
+                        last_confidence > 0.5 and last_frame_number != frame_number):
+
+                        logger.info(f"→ Frame number changed: {last_frame_number} (conf: {last_confidence:.3f}) → {frame_number} (conf: {confidence:.3f})")
+
+                        # Use any frame transition as sync point, not just 1→2
+                        sync_timestamp = frame_count / fps
+                        logger.info(f"✓ Found sync point: frame {last_frame_number}→{frame_number} transition at {sync_timestamp:.3f}s")
+                        break
+
+                    last_frame_number = frame_number
+                    last_confidence = confidence
             else:
-                logger.info(f"Frame {frame_count} at {current_time:.3f}s: no number detected")
-
-            # Only consider detections with confidence > 50%
-            if frame_number is not None and confidence > 0.5:
-                # Check for frame number change with both having high confidence
-                if (last_frame_number is not None and last_confidence is not None and
-                    last_confidence > 0.5 and last_frame_number != frame_number):
-
-                    logger.info(f"→ Frame number changed: {last_frame_number} (conf: {last_confidence:.3f}) → {frame_number} (conf: {confidence:.3f})")
-
-                    # Use any frame transition as sync point, not just 1→2
-                    sync_timestamp = current_time
-                    logger.info(f"✓ Found sync point: frame {last_frame_number}→{frame_number} transition at {sync_timestamp:.3f}s")
-                    break
-
-                last_frame_number = frame_number
-                last_confidence = confidence
-
-            frame_count += 1
-
-            # Safety break to avoid infinite loops (30 seconds from seek point)
-            if frame_count > (self.seek_distorted + 30) * fps:  # Don't analyze more than 30 seconds from seek point
-                logger.warning("Reached 30-second limit without finding sync point")
-                break
-
-        cap.release()
+                if frame_count + 1 >= end_frame:
+                    logger.warning("Reached 30-second limit without finding sync point")
 
         if sync_timestamp is None:
             logger.warning("Could not find sync point automatically. Using fallback method.")
-            sync_timestamp = self.find_sync_point_fallback(video_path)
+            sync_timestamp = self.find_sync_point_fallback(video_path, diff_tracker)
 
         return sync_timestamp
 
-    def find_sync_point_fallback(self, video_path):
-        """Fallback method using frame difference analysis."""
-        logger.info("Using fallback frame difference analysis")
+    def fallback_diff_tracker(self, video_info):
+        """FrameDiffTracker over the fallback window: 10 seconds from the seek point."""
+        fps = video_info['fps']
+        seek_frame = max(0, int(self.seek_distorted * fps))
+        return FrameDiffTracker(seek_frame, seek_frame + int(fps * 10), video_info)
 
-        cap = cv2.VideoCapture(str(video_path))
-        fps = cap.get(cv2.CAP_PROP_FPS)
+    def find_sync_point_fallback(self, video_path, diff_tracker=None):
+        """Fallback method using frame difference analysis.
 
-        # Skip to seek position if specified
-        if self.seek_distorted > 0:
-            seek_frame = int(self.seek_distorted * fps)
-            cap.set(cv2.CAP_PROP_POS_FRAMES, seek_frame)
-            logger.info(f"Seeking to {self.seek_distorted}s (frame {seek_frame}) for fallback analysis")
-
-        frame_count = int(self.seek_distorted * fps) if self.seek_distorted > 0 else 0
-        prev_frame = None
-        max_diff = 0
-        sync_frame = frame_count
-        analyze_frames = frame_count + int(fps * 10)  # Analyze 10 seconds from seek point
-
-        logger.info(f"Analyzing frames {frame_count} to {analyze_frames} for maximum difference")
-
-        while frame_count < analyze_frames:
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            if prev_frame is not None:
-                # Calculate frame difference
-                gray_curr = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                gray_prev = cv2.cvtColor(prev_frame, cv2.COLOR_BGR2GRAY)
-                diff = cv2.absdiff(gray_curr, gray_prev)
-                diff_score = np.sum(diff)
-
-                if diff_score > max_diff:
-                    max_diff = diff_score
-                    sync_frame = frame_count
-                    logger.debug(f"New max difference at frame {frame_count}: {diff_score}")
-
-            prev_frame = frame
-            frame_count += 1
-
-            # Progress indicator
-            if frame_count % int(fps) == 0:
-                logger.info(f"Analyzed {frame_count - int(self.seek_distorted * fps)}/{analyze_frames - int(self.seek_distorted * fps)} frames")
-
-        cap.release()
+        A diff_tracker that already observed the whole window during the
+        OCR scan is used as is; otherwise the window is decoded again.
+        """
+        logger.info("Using fallback frame difference analysis")
 
-        sync_timestamp = sync_frame / fps
-        logger.info(f"Fallback sync point found at frame {sync_frame} ({sync_timestamp:.3f}s) with diff score: {max_diff}")
+        if diff_tracker is not None and diff_tracker.complete:
+            logger.info(f"Using frame differences of frames {diff_tracker.first_index} to "
+                        f"{diff_tracker.end_index} gathered during the OCR scan")
+        else:
+            video_info = probe_video(video_path)
+            if video_info is None:
+                return None
+
+            diff_tracker = self.fallback_diff_tracker(video_info)
+            seek_frame = diff_tracker.first_index
+            analyze_count = diff_tracker.end_index - seek_frame
+            progress_interval = max(1, int(diff_tracker.fps))
+
+            # Skip to seek position if specified
+            if self.seek_distorted > 0:
+                logger.info(f"Seeking to {self.seek_distorted}s (frame {seek_frame}) for fallback analysis")
+
+            logger.info(f"Analyzing frames {seek_frame} to {diff_tracker.end_index} for maximum difference")
+
+            # Decode straight to grayscale on a VideoReader thread so ffmpeg's pipe
+            # reads overlap the diffs; only luma differences matter here
+            stop_event = threading.Event()
+            frames = iter_frames(video_path, video_info['width'], video_info['height'],
+                                 seek_frame / diff_tracker.fps, pix_fmt='gray', max_frames=analyze_count)
+            reader = VideoReader(frames, seek_frame, diff_tracker.end_index, stop_event, maxsize=FALLBACK_QUEUE_SIZE)
+            reader.start()
+            try:
+                analyzed = 0
+                while (item := reader.queue.get()) is not None:
+                    diff_tracker.observe(item['idx'], item['frame'])
+                    analyzed += 1
+
+                    # Progress indicator
+                    if (seek_frame + analyzed) % progress_interval == 0:
+                        logger.info("Analyzed %d/%d frames", analyzed, analyze_count)
+            finally:
+                stop_event.set()
+                reader.join()
+
+        sync_frame = diff_tracker.sync_frame
+        sync_timestamp = sync_frame / diff_tracker.fps
+        logger.info(f"Fallback sync point found at frame {sync_frame} ({sync_timestamp:.3f}s) "
+                    f"with diff score: {diff_tracker.max_diff}")
         return sync_timestamp
 
     def get_first_frame_number(self):
@@ -340,140 +1272,174 @@ class VideoSyncVMAF:
             logger.error("Trimmed video file does not exist")
             return None
 
-        cap = cv2.VideoCapture(str(self.trimmed_path))
-        if not cap.isOpened():
+        video_info = probe_video(self.trimmed_path)
+        if video_info is None:
             logger.error("Could not open trimmed video file")
             return None
 
         # Read the first frame
-        ret, frame = cap.read()
-        cap.release()
+        with closing(iter_frames(self.trimmed_path, video_info['width'], video_info['height'], max_frames=1)) as frames:
+            frame = next(frames, None)
 
-        if not ret:
+        if frame is None:
             logger.error("Could not read first frame from trimmed video")
             return None
 
         # Save first frame of trimmed video for validation
         trimmed_first_frame_path = self.results_dir / "trimmed_first_frame.png"
-        cv2.imwrite(str(trimmed_first_frame_path), frame)
+        write_image_async(trimmed_first_frame_path, frame)
         logger.info(f"Saved first frame of trimmed video: {trimmed_first_frame_path}")
 
-        # Extract frame number from first frame using EasyOCR
-        try:
-            results = self.ocr_reader.readtext(frame, allowlist='0123456789')
-
-            if results:
-                best_result = max(results, key=lambda x: x[2])
-                bbox, text, confidence = best_result
-                logger.info(f"EasyOCR on first frame extracted: '{text}' (conf: {confidence:.3f})")
+        # One recognition pass: template matching, then EasyOCR on the overlay box
+        frame_number, confidence = self.ocr.extract_frame_number_with_confidence(frame)
+        if frame_number is not None:
+            logger.info(f"First frame number detected: {frame_number} (conf: {confidence:.3f})")
+            return frame_number
 
-                if text.isdigit():
-                    frame_number = int(text)
-                    logger.info(f"First frame number detected: {frame_number}")
-                else:
-                    logger.warning(f"EasyOCR extracted non-digit text: '{text}'")
-                    frame_number = None
-            else:
-                logger.warning("No text detected by EasyOCR")
-                frame_number = None
-        except Exception as e:
-            logger.warning(f"EasyOCR failed: {e}")
-            frame_number = None
+        logger.warning("Could not detect frame number in first frame")
 
-        if frame_number is None:
-            logger.warning("Could not detect frame number in first frame")
+        # Analyze the frame content
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if len(frame.shape) == 3 else frame
 
-            # Analyze the frame content
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if len(frame.shape) == 3 else frame
+        # Check if frame is mostly black; mean, max and white count all come from one histogram pass
+        hist = cv2.calcHist([gray], [0], None, [256], [0, 256]).ravel()
+        total_pixels = gray.shape[0] * gray.shape[1]
+        mean_brightness = float(hist @ np.arange(256)) / total_pixels
+        max_brightness = int(np.flatnonzero(hist)[-1])
+        white_pixels = int(hist[OVERLAY_WHITE_THRESHOLD + 1:].sum())
 
-            # Check if frame is mostly black
-            mean_brightness = np.mean(gray)
-            max_brightness = np.max(gray)
-            white_pixels = np.sum(gray > 200)
-            total_pixels = gray.shape[0] * gray.shape[1]
+        logger.info(f"Frame analysis - Mean brightness: {mean_brightness:.1f}, Max brightness: {max_brightness}")
+        logger.info(f"White pixels (>{OVERLAY_WHITE_THRESHOLD}): {white_pixels}/{total_pixels} "
+                    f"({100*white_pixels/total_pixels:.1f}%)")
+        if white_pixels == 0:
+            logger.info("No overlay pixels in first frame; the trim may start before the frame counter appears")
 
-            logger.info(f"Frame analysis - Mean brightness: {mean_brightness:.1f}, Max brightness: {max_brightness}")
-            logger.info(f"White pixels (>200): {white_pixels}/{total_pixels} ({100*white_pixels/total_pixels:.1f}%)")
+        # Save debug frames
+        debug_path = self.results_dir / "debug_trimmed_first_frame_gray.png"
+        write_image_async(debug_path, gray)
+        logger.info(f"Saved debug grayscale frame: {debug_path}")
 
-            # Save debug frames
-            debug_path = self.results_dir / "debug_trimmed_first_frame_gray.png"
-            cv2.imwrite(str(debug_path), gray)
-            logger.info(f"Saved debug grayscale frame: {debug_path}")
-
-            # Try EasyOCR on grayscale
-            try:
-                results = self.ocr_reader.readtext(gray, allowlist='0123456789')
-                if results:
-                    best_result = max(results, key=lambda x: x[2])
-                    bbox, text, confidence = best_result
-                    logger.info(f"EasyOCR grayscale result: '{text}' (conf: {confidence:.3f})")
-                else:
-                    logger.info("No text detected by EasyOCR on grayscale")
-            except Exception as e:
-                logger.warning(f"EasyOCR grayscale failed: {e}")
-
-        return frame_number
+        return None
 
     def find_frame_in_original_video(self, target_frame_number):
-        """Find the frame number in reference video by scanning frame by frame."""
+        """Find the frame number in reference video by binary search, scanning frame by frame if that fails."""
         logger.info(f"Searching for frame number {target_frame_number} in reference video: {self.reference_path.name}")
 
-        cap = cv2.VideoCapture(str(self.reference_path))
-        if not cap.isOpened():
+        cached_position = load_frame_index(self.reference_path).get(target_frame_number)
+        if cached_position is not None:
+            logger.info(f"✓ Frame {target_frame_number} is at frame {cached_position} in {self.reference_path.name} "
+                        f"(from {frame_index_cache_path(self.reference_path)})")
+            return cached_position
+
+        video_info = probe_video(self.reference_path)
+        if video_info is None:
             logger.error(f"Could not open reference video for frame search: {self.reference_path.name}")
             return None
 
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        frame_count = 0
-
-        while frame_count < int(fps * 60):  # Limit to first 60 seconds
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            current_time = frame_count / fps
+        fps = video_info['fps']
+        end_frame = int(fps * 60)  # Limit to first 60 seconds
 
-            # Use EasyOCR to detect frame number
-            results = self.ocr_reader.readtext(frame, allowlist='0123456789')
-            detected_number = None
+        # The counter is monotonic, so a binary search usually settles it with a dozen probes
+        bisect_end = min(end_frame, video_info['total_frames']) if video_info['total_frames'] > 0 else end_frame
+        found = bisect_for_target(self.ocr, self._reference_pipe(video_info), 0, bisect_end, target_frame_number)
+        if found is not None:
+            found_position, frame = found
+            self._ref_frames[found_position] = frame
+            store_frame_index(self.reference_path, target_frame_number, found_position)
+            return found_position
 
-            if results:
-                best_result = max(results, key=lambda x: x[2])
-                bbox, text, confidence = best_result
-                if text.isdigit():
-                    detected_number = int(text)
+        logger.info("Binary search was inconclusive, scanning the reference video linearly")
 
-            # Log every frame for debugging
-            logger.info(f"[{self.reference_path.name}] Frame {frame_count} at {current_time:.3f}s: {detected_number if detected_number else 'no number'}")
+        # Sample every stride-th frame; a gap is only scanned when the target may lie inside it
+        stride = max(1, int(fps / 10))
 
-            if detected_number == target_frame_number:
-                logger.info(f"✓ Found target frame {target_frame_number} at frame {frame_count} ({current_time:.3f}s) in {self.reference_path.name}")
-                cap.release()
-                return frame_count
+        if self.easyocr_workers > 1:
+            found_position = self.scan_reference_in_workers(video_info, end_frame, target_frame_number, stride)
+        else:
+            found_position = scan_for_target(self.ocr, self.reference_path, video_info, 0, end_frame,
+                                             target_frame_number, stride)
 
-            frame_count += 1
+        if found_position is not None:
+            store_frame_index(self.reference_path, target_frame_number, found_position)
+            return found_position
 
-        cap.release()
         logger.warning(f"Could not find frame {target_frame_number} in first 60 seconds of {self.reference_path.name}")
         return None
 
+    def scan_reference_in_workers(self, video_info, end_frame, target_frame_number, stride):
+        """Scan contiguous segments of the reference video in EasyOCR worker processes.
+
+        Each spawned worker builds its own reader (torch models do not pickle).
+        The earliest match is returned as soon as every segment before it has
+        reported, and the pool is terminated rather than closed because
+        OCR workers do not always exit on their own.
+        """
+        workers = self.easyocr_workers
+        segment_length = max(stride, -(-end_frame // workers))
+        tasks = [(segment, self.reference_path, video_info, first_index, min(first_index + segment_length, end_frame),
+                  target_frame_number, stride)
+                 for segment, first_index in enumerate(range(0, end_frame, segment_length))]
+
+        logger.info(f"Scanning {len(tasks)} reference segments with {workers} EasyOCR worker processes")
+
+        segment_results = {}
+        found_position = None
+        context = multiprocessing.get_context('spawn')
+        # One CPU set per worker, handed out as each worker initializes
+        cpu_slice_queue = None
+        if (slices := cpu_slices(workers)) is not None:
+            cpu_slice_queue = context.Queue()
+            for cpus in slices:
+                cpu_slice_queue.put(cpus)
+        pool = context.Pool(workers, initializer=init_ocr_worker,
+                            initargs=(self.easyocr_batch_size, self.ocr_fp16, self.ocr_decode_scale,
+                                      cpu_slice_queue))
+        try:
+            for segment, position in pool.imap_unordered(scan_reference_segment, tasks):
+                segment_results[segment] = position
+                found_position = earliest_settled_match(segment_results, len(tasks))
+                if found_position is not None:
+                    break
+        finally:
+            pool.terminate()
+            pool.join()
+
+        if found_position is not None:
+            logger.info(f"✓ Found target frame {target_frame_number} at frame {found_position} in {self.reference_path.name}")
+        return found_position
+
+    def _reference_pipe(self, video_info):
+        if self._ref_pipe is None:
+            self._ref_pipe = FramePipe(self.reference_path, video_info)
+        return self._ref_pipe
+
+    def _get_ref_frame(self, frame_position):
+        """Return a full-size BGR reference frame, seeking the shared pipe to it the first time."""
+        frame = self._ref_frames.get(frame_position)
+        if frame is not None:
+            logger.debug("Reference frame %d already decoded", frame_position)
+            return frame
+
+        video_info = probe_video(self.reference_path)
+        if video_info is None:
+            logger.error(f"Could not open reference video: {self.reference_path.name}")
+            return None
+
+        frame = self._reference_pipe(video_info).read(frame_position)
+
+        if frame is not None:
+            self._ref_frames[frame_position] = frame
+        return frame
+
     def save_reference_frame_at_position(self, frame_position, frame_number):
         """Save a frame from the reference video at the found frame position."""
         logger.info(f"Saving frame {frame_number} from reference video at position {frame_position}")
 
-        cap = cv2.VideoCapture(str(self.reference_path))
-        if not cap.isOpened():
-            logger.error(f"Could not open reference video: {self.reference_path.name}")
-            return
+        frame = self._get_ref_frame(frame_position)
 
-        # Seek to the specific frame position
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_position)
-        ret, frame = cap.read()
-        cap.release()
-
-        if ret:
+        if frame is not None:
             reference_frame_path = self.results_dir / f"reference_frame_{frame_number}_at_position_{frame_position}.png"
-            cv2.imwrite(str(reference_frame_path), frame)
+            write_image_async(reference_frame_path, frame)
             logger.info(f"Saved reference frame: {reference_frame_path}")
         else:
             logger.warning(f"Could not read frame at position {frame_position} from reference video")
@@ -486,13 +1452,8 @@ class VideoSyncVMAF:
         distorted_copy_path = self.results_dir / self.distorted_path.name
 
         try:
-            # Use subprocess to copy the file (cross-platform)
-            if os.name == 'nt':  # Windows
-                subprocess.run(['copy', str(self.distorted_path), str(distorted_copy_path)],
-                             shell=True, check=True)
-            else:  # Unix/Linux/macOS
-                subprocess.run(['cp', str(self.distorted_path), str(distorted_copy_path)],
-                             check=True)
+            # shutil.copyfile uses copy_file_range/sendfile on Linux and fcopyfile on macOS
+            shutil.copyfile(self.distorted_path, distorted_copy_path)
 
             logger.info(f"✓ Distorted file copied to: {distorted_copy_path}")
 
@@ -503,7 +1464,7 @@ class VideoSyncVMAF:
 
             return True
 
-        except subprocess.CalledProcessError as e:
+        except OSError as e:
             logger.error(f"✗ Failed to copy distorted file: {e}")
             return False
         except Exception as e:
@@ -518,21 +1479,23 @@ class VideoSyncVMAF:
         logger.info(f"Input: {self.distorted_path}")
         logger.info(f"Output: {self.trimmed_path}")
 
-        cmd = [
-            'ffmpeg',
-            '-ss', str(int(start_time)),  # Seek before input for keyframe accuracy
-            '-i', str(self.distorted_path),
-            '-c', 'copy',  # Copy streams without re-encoding
-            '-avoid_negative_ts', 'make_zero',
-            '-y',  # Overwrite output file
-            str(self.trimmed_path)
-        ]
-
-        logger.info(f"FFmpeg command: {' '.join(cmd)}")
+        encoder = h264_encoder() if self.accurate_trim else None
+        if encoder is None:
+            # A stream copy can only start on a keyframe; pick it explicitly so the cut is known
+            keyframe_time = nearest_keyframe_time(self.distorted_path, start_time)
+            if keyframe_time is not None:
+                logger.info(f"Snapping trim start from {start_time:.3f}s to keyframe at {keyframe_time:.3f}s")
+                start_time = keyframe_time
 
         try:
-            logger.info("Executing FFmpeg command...")
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            try:
+                self.run_trim_command(self.trim_command(start_time, encoder))
+            except subprocess.CalledProcessError:
+                if encoder != 'h264_nvenc':
+                    raise
+                # NVENC can be compiled in yet unusable (no GPU, driver mismatch)
+                logger.warning("h264_nvenc trim failed, retrying with libx264")
+                self.run_trim_command(self.trim_command(start_time, 'libx264'))
 
             logger.info(f"✓ Video trimmed successfully: {self.trimmed_path}")
 
@@ -548,8 +1511,71 @@ class VideoSyncVMAF:
             logger.error(f"FFmpeg stderr: {e.stderr}")
             return False
 
+    def trim_command(self, start_time, encoder=None):
+        """Build the ffmpeg trim command; stream copy unless an encoder is given.
+
+        Both variants seek with -ss before -i, so the demuxer jumps straight
+        to the keyframe at or before start_time instead of decoding from the
+        start of the file. The copy cut stays on that keyframe; when
+        re-encoding, ffmpeg decodes only from that keyframe up to start_time,
+        which is what an outer coarse -ss plus an inner output -ss would do.
+        """
+        if encoder is None:
+            return [
+                'ffmpeg',
+                '-noaccurate_seek',
+                # Seek before input for keyframe accuracy; the margin keeps rounding from
+                # landing before a keyframe that start_time was snapped to
+                '-ss', f'{start_time + KEYFRAME_SEEK_MARGIN:.6f}',
+                '-i', str(self.distorted_path),
+                '-c', 'copy',  # Copy streams without re-encoding
+                '-avoid_negative_ts', 'make_zero',
+                *self.trim_container_flags(),
+                '-y',  # Overwrite output file
+                str(self.trimmed_path)
+            ]
+
+        cmd = ['ffmpeg']
+        if encoder == 'h264_nvenc':
+            cmd += ['-hwaccel', 'cuda']
+        cmd += ['-ss', str(start_time), '-i', str(self.distorted_path), '-c:v', encoder]
+        if encoder == 'h264_nvenc':
+            cmd += ['-preset', 'p4', '-cq', '18']
+        else:
+            cmd += ['-preset', 'veryfast', '-crf', '18']
+        # A keyframe every TRIM_KEYFRAME_INTERVAL keeps every frame close to a seek point
+        video_info = probe_video(self.distorted_path)
+        gop = max(1, round(video_info['fps'] * TRIM_KEYFRAME_INTERVAL)) if video_info else 30
+        cmd += ['-g', str(gop), '-keyint_min', str(gop)]
+        cmd += ['-c:a', 'copy', *self.trim_container_flags(), '-y', str(self.trimmed_path)]
+        return cmd
+
+    def trim_container_flags(self):
+        """Muxer flags writing an MP4/MOV trim as fragmented MP4, which players can seek without the full index.
+
+        Fragments start on keyframes, so this suits both the stream copy and
+        the re-encode. Other containers get no extra flags.
+        """
+        if self.trimmed_path.suffix.lower() not in FRAGMENTED_MP4_SUFFIXES:
+            return []
+        return ['-movflags', '+frag_keyframe+empty_moov+default_base_moof']
+
+    def run_trim_command(self, cmd):
+        """Run an ffmpeg trim command, raising CalledProcessError on failure."""
+        logger.info(f"FFmpeg command: {' '.join(cmd)}")
+        logger.info("Executing FFmpeg command...")
+        subprocess.run(cmd, capture_output=True, text=True, check=True)
+
     def run_vmaf_analysis(self, timestamp_offset):
-        """Run VMAF analysis using Docker with easyVmaf."""
+        """Run VMAF analysis using Docker with easyVmaf, or libvmaf_cuda when --gpu is set."""
+        if self.vmaf_gpu:
+            if not (ffmpeg_has_filter('libvmaf_cuda') and ffmpeg_has_filter('scale_cuda')):
+                logger.warning("⚠️ ffmpeg lacks the libvmaf_cuda or scale_cuda filter, falling back to easyVmaf")
+            elif self.run_vmaf_cuda(timestamp_offset):
+                return True
+            else:
+                logger.warning("⚠️ libvmaf_cuda analysis failed, falling back to easyVmaf")
+
         logger.info(f"🚀 Starting VMAF analysis with Docker from timestamp {timestamp_offset:.6f}s")
 
         # Mount directories for Docker access
@@ -566,6 +1592,8 @@ class VideoSyncVMAF:
             '-d', f'/videos/{self.results_dir.name}/{self.trimmed_path.name}',
             '-ss', str(timestamp_offset),
             '-endsync',
+            '-threads', str(self.vmaf_threads),
+            '-subsample', str(self.vmaf_subsample),
             '-output_fmt', 'json'
         ]
 
@@ -579,16 +1607,14 @@ class VideoSyncVMAF:
             process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
                                      text=True, universal_newlines=True)
 
-            line_count = 0
-            for line in process.stdout:
-                line_count += 1
-                logger.info(f"Docker: {line.strip()}")
-
-                # Log progress periodically
-                if line_count % 100 == 0:
-                    logger.info(f"Docker output: {line_count} lines processed")
+            # Drain output on a background thread so the pipe never stalls the container
+            output_tail = deque(maxlen=DOCKER_TAIL_LINES)
+            drain_thread = threading.Thread(target=drain_docker_output, args=(process.stdout, output_tail),
+                                            daemon=True)
+            drain_thread.start()
 
             process.wait()
+            drain_thread.join()
 
             if process.returncode == 0:
                 logger.info("✓ VMAF analysis completed successfully")
@@ -600,16 +1626,86 @@ class VideoSyncVMAF:
                         new_path = self.results_dir / vmaf_file.name
                         vmaf_file.rename(new_path)
                         logger.info(f"Moved VMAF result to: {new_path}")
+                        self.log_pooled_vmaf(new_path)
 
                 return True
             else:
                 logger.error(f"✗ Docker command failed with return code {process.returncode}")
+                for line in output_tail:
+                    logger.error(f"Docker: {line}")
                 return False
 
         except Exception as e:
             logger.error(f"✗ Error running VMAF analysis: {e}")
             return False
 
+    def run_vmaf_cuda(self, timestamp_offset):
+        """Score the trimmed video against the reference with ffmpeg's libvmaf_cuda filter.
+
+        Both inputs are decoded with NVDEC and stay in GPU memory; the
+        distorted stream is scaled to the reference size on the GPU. The
+        reference is seeked by timestamp_offset, matching easyVmaf's -ss.
+        """
+        reference_info = probe_video(self.reference_path)
+        if reference_info is None:
+            return False
+
+        json_path = self.results_dir / f"{self.trimmed_path.stem}_vmaf.json"
+        gpu_input = ['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda']
+        filter_graph = (
+            f"[0:v]scale_cuda=format=yuv420p[ref];"
+            f"[1:v]scale_cuda=w={reference_info['width']}:h={reference_info['height']}:format=yuv420p[dis];"
+            f"[dis][ref]libvmaf_cuda=shortest=1:n_subsample={self.vmaf_subsample}"
+            f":log_fmt=json:log_path={json_path}"
+        )
+        cmd = ['ffmpeg', '-hide_banner', '-y',
+               *gpu_input, '-ss', f'{timestamp_offset:.6f}', '-i', str(self.reference_path),
+               *gpu_input, '-i', str(self.trimmed_path),
+               '-filter_complex', filter_graph,
+               '-f', 'null', '-']
+
+        logger.info(f"🚀 Starting VMAF analysis with libvmaf_cuda from timestamp {timestamp_offset:.6f}s")
+        logger.info(f"FFmpeg command: {' '.join(cmd)}")
+
+        try:
+            process = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                       stderr=subprocess.PIPE, text=True)
+        except OSError as e:
+            logger.error(f"✗ Error running libvmaf_cuda analysis: {e}")
+            return False
+
+        output_tail = deque(maxlen=DOCKER_TAIL_LINES)
+        drain_thread = threading.Thread(target=drain_docker_output, args=(process.stderr, output_tail),
+                                        kwargs={'source': 'FFmpeg'}, daemon=True)
+        drain_thread.start()
+        process.wait()
+        drain_thread.join()
+
+        if process.returncode != 0 or not json_path.exists():
+            logger.error(f"✗ libvmaf_cuda failed with return code {process.returncode}")
+            for line in output_tail:
+                logger.error(f"FFmpeg: {line}")
+            return False
+
+        logger.info(f"✓ VMAF analysis completed successfully: {json_path}")
+        self.log_pooled_vmaf(json_path)
+        return True
+
+    def log_pooled_vmaf(self, json_path):
+        """Log the pooled VMAF score libvmaf wrote into json_path, if present."""
+        try:
+            with open(json_path) as f:
+                pooled = json.load(f).get('pooled_metrics', {}).get('vmaf')
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Could not read VMAF results from {json_path.name}: {e}")
+            return
+
+        if pooled and 'mean' in pooled:
+            logger.info(f"📊 VMAF score ({json_path.name}): mean {pooled['mean']:.2f}, "
+                        f"min {pooled.get('min', float('nan')):.2f}, max {pooled.get('max', float('nan')):.2f}")
+        else:
+            logger.warning(f"No pooled VMAF score in {json_path.name}")
+
     def generate_vmaf_plots(self):
         """Generate VMAF plots by running the plot_vmaf.py script on the JSON results."""
         logger.info("Searching for VMAF JSON files to plot")
@@ -666,77 +1762,86 @@ class VideoSyncVMAF:
         logger.info("🎬 Starting video sync and VMAF analysis")
         start_time = datetime.now()
 
-        # Step 1: Find sync point in distorted video
-        logger.info("📊 Step 1: Finding sync point")
-        sync_timestamp = self.find_sync_point(self.distorted_path)
+        # The copy only depends on the input file, so it runs alongside the OCR and ffmpeg steps
+        copy_future = _io_pool.submit(self.copy_distorted_file)
 
-        if sync_timestamp is None:
-            logger.error("✗ Could not determine sync point")
-            return False
+        try:
+            # Step 1: Find sync point in distorted video
+            logger.info("📊 Step 1: Finding sync point")
+            sync_timestamp = self.find_sync_point(self.distorted_path)
+
+            if sync_timestamp is None:
+                logger.error("✗ Could not determine sync point")
+                return False
 
-        logger.info(f"✓ Sync point determined: {sync_timestamp:.3f}s")
+            logger.info(f"✓ Sync point determined: {sync_timestamp:.3f}s")
 
-        # Step 2: Trim the distorted video
-        logger.info("✂️ Step 2: Trimming distorted video")
-        if not self.trim_video(sync_timestamp):
-            logger.error("✗ Failed to trim video")
-            return False
+            # Step 2: Trim the distorted video
+            logger.info("✂️ Step 2: Trimming distorted video")
+            if not self.trim_video(sync_timestamp):
+                logger.error("✗ Failed to trim video")
+                return False
 
-        # Step 4: Get first frame number from trimmed video and save as PNG
-        logger.info("🔍 Step 4: Getting first frame number from trimmed video")
-        first_frame_number = self.get_first_frame_number()
+            # Step 4: Get first frame number from trimmed video and save as PNG
+            logger.info("🔍 Step 4: Getting first frame number from trimmed video")
+            first_frame_number = self.get_first_frame_number()
 
-        # Step 5: Get frame number from trimmed video
-        logger.info("📖 Step 5: Reading frame number from trimmed video")
-        if first_frame_number is not None:
-            logger.info(f"✓ Frame number from trimmed video: {first_frame_number}")
+            # Step 5: Get frame number from trimmed video
+            logger.info("📖 Step 5: Reading frame number from trimmed video")
+            if first_frame_number is not None:
+                logger.info(f"✓ Frame number from trimmed video: {first_frame_number}")
 
-            # Step 6: Find that frame in original video
-            logger.info(f"🔍 Step 6: Finding frame {first_frame_number} in original video")
-            found_frame_position = self.find_frame_in_original_video(first_frame_number)
+                # Step 6: Find that frame in original video
+                logger.info(f"🔍 Step 6: Finding frame {first_frame_number} in original video")
+                found_frame_position = self.find_frame_in_original_video(first_frame_number)
 
-            if found_frame_position is not None:
-                # Convert frame position to timestamp (assuming 30fps)
-                vmaf_offset = found_frame_position / 30.0
-                logger.info(f"✓ Found frame {first_frame_number} at frame position {found_frame_position}")
-                logger.info(f"✓ Converting to timestamp: {vmaf_offset:.6f}s for VMAF analysis")
+                if found_frame_position is not None:
+                    # Convert frame position to timestamp (assuming 30fps)
+                    vmaf_offset = found_frame_position / 30.0
+                    logger.info(f"✓ Found frame {first_frame_number} at frame position {found_frame_position}")
+                    logger.info(f"✓ Converting to timestamp: {vmaf_offset:.6f}s for VMAF analysis")
 
-                # Save the found frame from reference video
-                self.save_reference_frame_at_position(found_frame_position, first_frame_number)
+                    # Save the found frame from reference video
+                    self.save_reference_frame_at_position(found_frame_position, first_frame_number)
+                else:
+                    logger.warning("Could not find frame in original video, using 0")
+                    vmaf_offset = 0
             else:
-                logger.warning("Could not find frame in original video, using 0")
+                logger.warning("No frame number detected, using 0")
                 vmaf_offset = 0
-        else:
-            logger.warning("No frame number detected, using 0")
-            vmaf_offset = 0
 
 
-        # Step 7: Run VMAF analysis
-        logger.info("📈 Step 7: Running VMAF analysis")
-        if not self.run_vmaf_analysis(vmaf_offset):
-            logger.error("✗ Failed to run VMAF analysis")
-            return False
+            # Step 7: Run VMAF analysis
+            logger.info("📈 Step 7: Running VMAF analysis")
+            if not self.run_vmaf_analysis(vmaf_offset):
+                logger.error("✗ Failed to run VMAF analysis")
+                return False
 
-        # Step 8: Copy distorted file to results directory
-        logger.info("📄 Step 8: Copying distorted file to results directory")
-        if not self.copy_distorted_file():
-            logger.warning("⚠️ Failed to copy distorted file (continuing anyway)")
-
-        # Step 9: Generate VMAF plots
-        logger.info("📊 Step 9: Generating VMAF plots")
-        if not self.generate_vmaf_plots():
-            logger.warning("⚠️ Failed to generate VMAF plots (continuing anyway)")
-
-        # Summary
-        end_time = datetime.now()
-        duration = end_time - start_time
-        logger.info("🎉 Process completed successfully!")
-        logger.info(f"⏱️ Total processing time: {duration.total_seconds():.1f} seconds")
-        logger.info(f"📁 Results directory: {self.results_dir}")
-        logger.info(f"📄 Results logged to: {self.results_log}")
-        logger.info(f"🎥 Trimmed video: {self.trimmed_path}")
+            # Step 8: Copy distorted file to results directory (started in the background at step 1)
+            logger.info("📄 Step 8: Copying distorted file to results directory")
+            if not copy_future.result():
+                logger.warning("⚠️ Failed to copy distorted file (continuing anyway)")
+
+            # Step 9: Generate VMAF plots
+            logger.info("📊 Step 9: Generating VMAF plots")
+            if not self.generate_vmaf_plots():
+                logger.warning("⚠️ Failed to generate VMAF plots (continuing anyway)")
+
+            # Summary
+            end_time = datetime.now()
+            duration = end_time - start_time
+            # One record, so the console and file handlers are locked and flushed once
+            logger.info("🎉 Process completed successfully!\n"
+                        "⏱️ Total processing time: %.1f seconds\n"
+                        "📁 Results directory: %s\n"
+                        "📄 Results logged to: %s\n"
+                        "🎥 Trimmed video: %s",
+                        duration.total_seconds(), self.results_dir, self.results_log, self.trimmed_path)
 
-        return True
+            return True
+        finally:
+            if self._ref_pipe is not None:
+                self._ref_pipe.close()
 
 def main():
     parser = argparse.ArgumentParser(description='Video sync detection and VMAF scoring')
@@ -747,19 +1852,39 @@ def main():
                        help='Buffer time in seconds after sync point (default: 5.0)')
     parser.add_argument('--seek-distorted', type=float, default=0.0,
                        help='Skip this many seconds when looking for numbered frames in distorted video (default: 0.0)')
+    parser.add_argument('--easyocr-workers', type=int, default=1,
+                       help='Worker processes for the reference frame search, each with its own EasyOCR reader (default: 1)')
+    parser.add_argument('--easyocr-batch-size', type=int, default=OCR_BATCH_SIZE,
+                       help=f'Frames per batched EasyOCR call (default: {OCR_BATCH_SIZE})')
+    parser.add_argument('--ocr-fp32', action='store_true',
+                       help='Run EasyOCR in full precision on CUDA instead of fp16 autocast')
+    parser.add_argument('--ocr-fullres', action='store_true',
+                       help=f'Decode OCR scans at full resolution instead of 1/{OCR_DECODE_SCALE} scale')
+    parser.add_argument('--accurate-trim', action='store_true',
+                       help='Re-encode the trimmed video for a frame-accurate cut (h264_nvenc when available, else libx264; WebM/Ogg inputs are written as .mkv)')
+    parser.add_argument('--vmaf-threads', type=int, default=None,
+                       help='Threads libvmaf uses inside the easyVmaf container (default: CPU count)')
+    parser.add_argument('--subsample', type=int, default=1,
+                       help='Score every Nth frame for a faster, approximate VMAF (default: 1, every frame)')
+    parser.add_argument('--gpu', action='store_true',
+                       help="Score with the local ffmpeg's libvmaf_cuda filter, falling back to easyVmaf when it is unavailable")
 
     args = parser.parse_args()
 
     try:
-        processor = VideoSyncVMAF(args.reference, args.distorted, args.buffer, args.seek_distorted)
+        config = SyncConfig(args.reference, args.distorted, args.buffer, args.seek_distorted,
+                            easyocr_workers=args.easyocr_workers, easyocr_batch_size=args.easyocr_batch_size,
+                            ocr_fp16=not args.ocr_fp32, ocr_fullres=args.ocr_fullres, accurate_trim=args.accurate_trim,
+                            vmaf_threads=args.vmaf_threads, vmaf_subsample=args.subsample, vmaf_gpu=args.gpu)
+        processor = VideoSyncVMAF(config)
         # Apply debug setting after logger is configured
         if args.debug:
             setup_logging(processor.results_log, debug=True)
         success = processor.process()
         sys.exit(0 if success else 1)
 
-    except Exception as e:
-        logger.error(f"Fatal error: {e}")
+    except (FileNotFoundError, subprocess.CalledProcessError, VMAFError) as e:
+        logger.error("Fatal error: %s", e)
         sys.exit(1)
 
 if __name__ == '__main__':